@@ -1,6 +1,7 @@
 # Import all of our necessary libraries
 
 import dash
+import flask
 import dash_table
 import dash_core_components as dcc
 import dash_html_components as html
@@ -8,7 +9,22 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objs as go
 from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 from textwrap import dedent
+from collections import OrderedDict
+import bisect
+import contextlib
+import cProfile
+import functools
+import glob
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import tracemalloc
+import warnings
 
 # Defining app and reading in css code
 
@@ -17,115 +33,1239 @@ external_stylesheets = ['https://codepen.io/chriddyp/pen/bWLwgP.css']
 app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
 app.config['suppress_callback_exceptions'] = True
 
+# the Flask app underneath, the WSGI entry point for production servers
+# (gunicorn -c gunicorn.conf.py baseballStatisticsVisualization:server)
+
+server = app.server
+
+# Location of the Lahman core csv files, and of the binary cache built from
+# them (both can be pointed elsewhere through environment variables)
+
+data_path = os.environ.get("LAHMAN_DATA_PATH", "/Users/CookedKaleDev/\
+Downloads/baseballdatabank-2019.2/core/")
+cache_path = os.environ.get("LAHMAN_CACHE_PATH",
+                            os.path.join(data_path, ".cache"))
+
+# Startup profiler
+# with LAHMAN_STARTUP_PROFILE set, every named load phase (each cached frame
+# or array store, the search indexes, the layout, the callbacks) is timed
+# and its memory measured with tracemalloc, and a table sorted by time is
+# printed once the module has loaded; phases nest ("within" names the
+# enclosing phase), so "self s" is the time not spent in a nested phase,
+# "peak MB" is the most memory the phase had allocated at once and
+# "kept MB" what was still allocated when it ended
+# LAHMAN_STARTUP_PROFILE=1 only prints the table, a path ending in .json
+# also writes the phases there and one ending in .pstats also writes a
+# cProfile profile of the whole load (tracemalloc, and cProfile even more,
+# slow the load down, the times are for comparing phases and runs rather
+# than absolute)
+
+class StartupProfile:
+
+    def __init__(self, target):
+        self.target = target
+        self.phases = []
+        self.stack = []
+        self.profiler = None
+        if target.endswith(".pstats"):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if target:
+            tracemalloc.start()
+        self.begin("startup")
+
+    def begin(self, name):
+        if not self.target:
+            return
+        if self.stack:
+            self.stack[-1]["peak"] = max(self.stack[-1]["peak"],
+                                         tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        memory = tracemalloc.get_traced_memory()[0]
+        self.stack.append({"phase" : name, "within" : self.stack[-1]["phase"]
+                           if self.stack else None,
+                           "start" : time.perf_counter(), "memory" : memory,
+                           "peak" : memory, "nested" : 0.0})
+
+    def end(self):
+        if not self.target:
+            return
+        entry = self.stack.pop()
+        seconds = time.perf_counter() - entry.pop("start")
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, entry.pop("peak"))
+        memory = entry.pop("memory")
+        entry.update(seconds = round(seconds, 4),
+                     self_seconds = round(seconds - entry.pop("nested"), 4),
+                     peak_mb = round((peak - memory) / 2**20, 2),
+                     kept_mb = round((current - memory) / 2**20, 2))
+        if self.stack:
+            self.stack[-1]["nested"] += seconds
+            self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+        self.phases.append(entry)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def report(self):
+        if not self.target:
+            return
+        while self.stack:
+            self.end()
+        # later phases (snapshots loaded by a reload) are not profiled
+        target, self.target = self.target, ""
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(target)
+        tracemalloc.stop()
+        print("{:<24}{:<16}{:>9}{:>9}{:>9}{:>9}".format(
+        "phase", "within", "s", "self s", "peak MB", "kept MB"))
+        for entry in sorted(self.phases, key = lambda entry: -entry["seconds"]):
+            print("{:<24}{:<16}{:>9.3f}{:>9.3f}{:>9.1f}{:>9.1f}".format(
+            entry["phase"], entry["within"] or "", entry["seconds"],
+            entry["self_seconds"], entry["peak_mb"], entry["kept_mb"]))
+        if target.endswith(".json"):
+            with open(target, "w") as out:
+                json.dump({"data_path" : data_path, "phases" : self.phases},
+                          out, indent = 2)
+
+startup_profile = StartupProfile(os.environ.get("LAHMAN_STARTUP_PROFILE", ""))
+
+# bump this whenever the way one of the cached frames is built changes, so
+# that pickles written by an older version of this file are never reused
+
+cache_version = 10
+
+# Every table and derived frame is pickled into the cache directory under a
+# key made from the size and modification time of the csv files it was built
+# from. A warm start only unpickles frames, skipping both the csv parsing and
+# the pandas merges/pivots, and replacing any source csv (e.g. a new databank
+# release) changes the key so the frame is rebuilt and the old pickle removed
+# (the rolling window the season indexes are built with is part of the key
+# too, see running_stats, and so are the pandas and numpy versions, whose
+# pickles an upgrade may no longer read)
+# a pickle that cannot be read anyway (a damaged file) is rebuilt like a
+# missing one instead of failing the import
+
+def source_key(files):
+    digest = hashlib.md5("{}:{}:{}:{}".format(
+    cache_version, rolling_seasons, pd.__version__, np.__version__).encode())
+    for name in files:
+        stat = os.stat(os.path.join(data_path, name))
+        digest.update("{}:{}:{};".format(
+        name, stat.st_size, stat.st_mtime_ns).encode())
+    return digest.hexdigest()[:16]
+
+# a temporary file or directory ("<name>-<key>....<pid>.tmp") left by a
+# process that was killed while writing it: its pid is gone, or it is older
+# than any write takes (the pid may have been reused, or belong to another
+# host sharing the cache)
+
+temp_max_seconds = 3600
+
+def abandoned_temp(path):
+    try:
+        pid = int(path[:-len(".tmp")].rsplit(".", 1)[1])
+        os.kill(pid, 0)
+    except (ValueError, IndexError, ProcessLookupError):
+        return True
+    except OSError:
+        # (PermissionError, the pid belongs to another user)
+        pass
+    try:
+        return time.time() - os.path.getmtime(path) > temp_max_seconds
+    except OSError:
+        return False
+
+def cached_frame(name, files, build):
+    with startup_profile.phase(name):
+        path = os.path.join(cache_path,
+                            "{}-{}.pkl".format(name, source_key(files)))
+        if os.path.exists(path):
+            try:
+                return pd.read_pickle(path)
+            except Exception as error:
+                warnings.warn("rebuilding unreadable cache file {}: {!r}"
+                              .format(path, error))
+        frame = build()
+        temp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            for stale in glob.glob(os.path.join(cache_path, name + "-*.pkl")):
+                os.remove(stale)
+            for stale in glob.glob(os.path.join(cache_path,
+                                                name + "-*.pkl.*.tmp")):
+                if abandoned_temp(stale):
+                    with contextlib.suppress(OSError):
+                        os.remove(stale)
+            # write to a temporary file first so that another process
+            # starting at the same time never reads a half written pickle
+            frame.to_pickle(temp)
+            os.replace(temp, path)
+        except OSError:
+            # a read only data directory just means running without the
+            # cache (and a pickle half written before a full disk is
+            # removed, the sweep above never matches it)
+            with contextlib.suppress(OSError):
+                os.remove(temp)
+        return frame
+
+# The numeric arrays the callbacks read (season indexes and team series) are
+# cached the same way, but as a directory of .npy files per key that is
+# memory mapped read only instead of unpickled; every process serving the
+# app, forked or not, then reads the same pages from the OS page cache
+# rather than holding its own copy on the heap
+# nested dicts of arrays are saved as nested directories
+
+def save_arrays(path, arrays):
+    os.makedirs(path)
+    for key, value in arrays.items():
+        if isinstance(value, dict):
+            save_arrays(os.path.join(path, key), value)
+        else:
+            np.save(os.path.join(path, key + ".npy"), np.asarray(value),
+                    allow_pickle = False)
+
+def load_arrays(path):
+    arrays = {}
+    for entry in os.scandir(path):
+        if entry.is_dir():
+            arrays[entry.name] = load_arrays(entry.path)
+        elif entry.name.endswith(".npy"):
+            arrays[entry.name[:-4]] = np.load(entry.path, mmap_mode = "r")
+    return arrays
+
+def cached_arrays(name, files, build):
+    with startup_profile.phase(name):
+        path = os.path.join(cache_path,
+                            "{}-{}".format(name, source_key(files)))
+        if os.path.isdir(path):
+            return load_arrays(path)
+        arrays = build()
+        temp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            # (not the .tmp directories other processes are still writing,
+            # only abandoned ones, nor this key's directory if one of them
+            # has just finished it)
+            for stale in glob.glob(os.path.join(cache_path, name + "-*")):
+                if stale != path and (not stale.endswith(".tmp") or
+                                      abandoned_temp(stale)):
+                    shutil.rmtree(stale, ignore_errors=True)
+            save_arrays(temp, arrays)
+            os.replace(temp, path)
+        except OSError:
+            # read only cache (or another process got there first and the
+            # rename onto its directory failed), keep the arrays that were
+            # just built and leave no half of them behind
+            shutil.rmtree(temp, ignore_errors=True)
+            if not os.path.isdir(path):
+                return arrays
+        return load_arrays(path)
+
+# Explicit column types for each Lahman table
+# ID and flag columns repeat across hundreds of thousands of rows, so they are
+# read as categoricals; counting stats fit in 16 bits and are read as
+# nullable ints since most of them are missing for the early seasons; ratio
+# stats (ERA, BAOpp, FP, ...) are left as float64 so no chart value changes
+
+def counting(*cols, dtype = "Int16"):
+    return {col : dtype for col in cols}
+
+lahman_ids = {"playerID" : "category", "yearID" : "int16",
+              "stint" : "int8", "teamID" : "category", "lgID" : "category"}
+
+lahman_schema = {
+"People" : {"bats" : "category", "throws" : "category",
+            **counting("weight", "height")},
+"Batting" : {**lahman_ids, **counting("G", "AB", "R", "H", "2B", "3B", "HR",
+             "RBI", "SB", "CS", "BB", "SO", "IBB", "HBP", "SH", "SF",
+             "GIDP")},
+"Pitching" : {**lahman_ids, **counting("W", "L", "G", "GS", "CG", "SHO", "SV",
+              "IPouts", "H", "ER", "HR", "BB", "SO", "IBB", "WP", "HBP", "BK",
+              "BFP", "GF", "R", "SH", "SF", "GIDP")},
+"Fielding" : {**lahman_ids, "POS" : "category", **counting("G", "GS",
+              "InnOuts", "PO", "A", "E", "DP", "PB", "WP", "SB", "CS")},
+"Teams" : {"yearID" : "int16", "lgID" : "category", "teamID" : "category",
+           "franchID" : "category", "divID" : "category",
+           "DivWin" : "category", "WCWin" : "category", "LgWin" : "category",
+           "WSWin" : "category", "name" : "category", "park" : "category",
+           "teamIDBR" : "category", "teamIDlahman45" : "category",
+           "teamIDretro" : "category", **counting("Rank", "G", "Ghome", "W",
+           "L", "R", "AB", "H", "2B", "3B", "HR", "BB", "SO", "SB", "CS",
+           "HBP", "SF", "RA", "ER", "CG", "SHO", "SV", "IPouts", "HA", "HRA",
+           "BBA", "SOA", "E", "DP", "BPF", "PPF"),
+           **counting("attendance", dtype = "Int32")},
+"TeamsFranchises" : {"franchID" : "category", "active" : "category",
+                     "NAassoc" : "category"},
+"HallOfFame" : {"playerID" : "category", "yearid" : "int16",
+                "votedBy" : "category", "inducted" : "category",
+                "category" : "category", "needed_note" : "category",
+                **counting("ballots", "needed", "votes")},
+"AllstarFull" : {**lahman_ids, "gameNum" : "int8",
+                 **counting("GP", "startingPos", dtype = "Int8")},
+"AwardsPlayers" : {"playerID" : "category", "awardID" : "category",
+                   "yearID" : "int16", "lgID" : "category",
+                   "tie" : "category", "notes" : "category"},
+}
+
+def read_table(name, **kwargs):
+    schema = lahman_schema.get(name, {})
+    # read_csv parses straight into the nullable int types several times
+    # slower than into float64, so those columns are converted afterwards
+    nullable = {col : dtype for col, dtype in schema.items()
+                if dtype[0] in "IU"}
+    frame = pd.read_csv(os.path.join(data_path, name + ".csv"),
+                        dtype = {col : dtype for col, dtype in schema.items()
+                                 if col not in nullable}, **kwargs)
+    return frame.astype({col : dtype for col, dtype in nullable.items()
+                         if col in frame.columns})
+
+# numpy array for one column, with the nullable int columns turned into
+# float32 (exact for any count) so missing values come out as NaN
+
+def column_array(column):
+    if (pd.api.types.is_extension_array_dtype(column.dtype) and
+        pd.api.types.is_integer_dtype(column.dtype)):
+        return column.to_numpy(dtype = "float32", na_value = np.nan)
+    if (pd.api.types.is_extension_array_dtype(column.dtype) and
+        pd.api.types.is_float_dtype(column.dtype)):
+        return column.to_numpy(dtype = "float64", na_value = np.nan)
+    return column.to_numpy()
+
+# bytes held by a frame, and what the same frame would hold with the default
+# dtypes read_csv picks (object strings, int64/float64)
+
+def frame_bytes(frame):
+    return int(frame.memory_usage(index = True, deep = True).sum())
+
+def default_dtypes(frame):
+    upcast = {}
+    for col, dtype in frame.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            upcast[col] = object
+        elif pd.api.types.is_integer_dtype(dtype):
+            upcast[col] = "int64" if not frame[col].isna().any() else "float64"
+        elif pd.api.types.is_float_dtype(dtype):
+            upcast[col] = "float64"
+    return frame.astype(upcast)
+
 # Loading in all of our data and formatting it in order to be used to build
 # our Dash visualization
 
-people = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/People.csv",
-                     usecols = ["playerID","nameFirst","nameLast","weight",
-                     "height","bats","throws","debut","finalGame"])
+def build_people(tables):
+    return read_table("People",
+                      usecols = ["playerID","nameFirst","nameLast","weight",
+                      "height","bats","throws","debut","finalGame"])
+
+# people is the one dimension table for names and biographical fields, the
+# stat tables below only carry an integer player code (the player's row in
+# people) and are joined back to people by that code when a view needs a
+# name, instead of every stat row repeating the people columns
+# player_codes maps the playerIDs used as dropdown values to those codes
+
+def build_player_ids(tables):
+    return pd.CategoricalDtype(tables["people"]["playerID"].astype(str))
+
+def build_player_codes(tables):
+    categories = tables["player_ids"].categories
+    return dict(zip(categories, range(len(categories))))
+
+def player_code(player_ids, playerID):
+    return playerID.astype(str).astype(player_ids).cat.codes.astype("int32")
 
 # creating dataframes for pitching, fielding and hitting individual
-# statistics, merging them with our people dataset
-# and dropping duplicates so that they can properly
-# read into our Dash components
-
-# Opted to format these 3 dataframes in the same way separately (instead
-# of managing to keep it DRY) due to issues with the df merges persisting
-# outside of functions scope
-
-pitching = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/Pitching.csv")
-pitching = pd.merge(people, pitching, how='left', on='playerID')
-pitching = pitching.drop_duplicates(subset = ["playerID" , "yearID"])
-fielding = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/Fielding.csv")
-fielding = pd.merge(people, fielding, how='left', on='playerID')
-fielding = fielding.drop_duplicates(subset = ["playerID" , "yearID"])
-batting = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/Batting.csv")
-batting = pd.merge(people, batting, how='left', on='playerID')
-batting = batting.drop_duplicates(subset = ["playerID" , "yearID"])
+# statistics, one row per player season, keyed by player code so that they
+# can properly read into our Dash components
+
+# the raw csv rows are stints (a traded player has one row per team, and a
+# fielder one row per position as well), they are kept as they are for
+# drilling down into multi-team seasons (rows for playerIDs missing from
+# people are left out, like the old merge with people did)
+# (as for Teams, only empty fields are read as missing, so the National
+# Association's lgID "NA" stays a league)
+
+def read_stints(name, player_ids):
+    stints = read_table(name, keep_default_na = False, na_values = [""])
+    stints.insert(0, "player", player_code(player_ids, stints.pop("playerID")))
+    return stints[stints["player"] >= 0].reset_index(drop = True)
+
+# Rolling the stints up into seasons in one groupby pass
+# counting stats are summed over all stints (for fielding that includes
+# every position, so games and innings count position-games), teamID lists
+# every team played for in order ("SEA/NYA"), lgID becomes "ML" when the
+# stints were in different leagues, and ratio stats are recomputed from the
+# summed components for multi-stint seasons (single stint seasons keep the
+# published value)
+# ratio stats without a formula (fielding's zone rating, the float columns
+# not in ratios) cannot be added up, a season only keeps one when it was a
+# single row and is missing it otherwise
+
+def rollup_seasons(stints, ratios = None):
+    ratios = ratios or {}
+    keys = ["player", "yearID"]
+    # (lgID as plain objects, groupby first has no fast path for
+    # categoricals; a missing lgID stays missing rather than "nan")
+    stints = stints.sort_values(keys, kind="mergesort").astype(
+    {"lgID" : object})
+    grouped = stints.groupby(keys, observed = True)
+    stats = [col for col in stints.columns if col not in
+             keys + ["stint", "teamID", "lgID", "POS"]]
+    unsummed = [col for col in stats if col not in ratios and
+                stints[col].dtype == np.float64]
+    seasons = grouped[[col for col in stats if col not in unsummed]].sum(
+    min_count = 1)
+    rows = grouped.size()
+    for col, values in grouped[unsummed].first().items():
+        seasons[col] = values.where(rows == 1)
+    seasons = seasons[stats]
+    seasons["stints"] = grouped["stint"].nunique().astype("int8")
+    played_for = stints.drop_duplicates(subset = keys + ["teamID"])
+    starts = np.flatnonzero(~played_for.duplicated(subset = keys).to_numpy())
+    seasons["teamID"] = pd.Series(np.add.reduceat(
+    ("/" + played_for["teamID"].astype(str)).to_numpy(), starts)
+    ).str[1:].astype("category").to_numpy()
+    leagues = grouped["lgID"].agg(["first", "nunique"])
+    seasons["lgID"] = leagues["first"].where(
+    leagues["nunique"] <= 1, "ML").astype("category")
+    first = grouped[list(ratios)].first()
+    for col, ratio in ratios.items():
+        seasons[col] = ratio(seasons).astype("float64").replace(
+        [np.inf, -np.inf], np.nan).where(seasons["stints"] > 1, first[col])
+    return seasons.reset_index()
 
 # creating a batting average column using the hits and at bats columns,
 # rounding it to 2 decimal places
 
-batting["BA"] = np.round(((batting["H"] / batting["AB"]) * 1000) , 2)
+batting_ratios = {
+"BA" : lambda seasons: np.round(((seasons["H"] / seasons["AB"]) * 1000), 2)}
 
-# hall of fame and all star categories will be used for annotations to
-# differentiate players in Dash application
+def build_batting(stints):
+    batting = rollup_seasons(stints)
+    batting["BA"] = batting_ratios["BA"](batting).astype("float64")
+    return batting
 
-hallofFame = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/HallOfFame.csv")
-all_stars = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/AllstarFull.csv")
+# ERA is earned runs per 27 outs, opponents' batting average is hits over
+# batters faced less the plate appearances that are not at bats
 
-# awards dataframe will be used to color code individual graphics to show
-# seasons in which players won awards
-# only MVP, silver slugger, gold glove, and cy young will be used so these
-# are extracted from the dataset
+pitching_ratios = {
+"ERA" : lambda seasons: np.round(27 * seasons["ER"] / seasons["IPouts"], 2),
+"BAOpp" : lambda seasons: np.round(seasons["H"] / (seasons["BFP"] -
+seasons["BB"] - seasons["HBP"] - seasons["SH"] - seasons["SF"]), 3)}
+
+# ratio stats recomputed from their components wherever seasons are added
+# up (careers, running totals)
+
+season_ratios = {"batting" : batting_ratios, "pitching" : pitching_ratios,
+                 "fielding" : {}}
 
-Awards_Players = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/AwardsPlayers.csv")
-Awards_Players = Awards_Players[
-(Awards_Players["awardID"] == "Most Valuable Player") |
-(Awards_Players["awardID"] == "Silver Slugger") |
-(Awards_Players["awardID"] == "Gold Glove") |
-(Awards_Players["awardID"] == "Cy Young Award")]
+# the season frames are only loaded to build the season indexes below (and
+# for the memory report), a warm start maps the indexes without them
+
+season_frames = {
+"batting" : (["People.csv", "Batting.csv"], build_batting),
+"pitching" : (["People.csv", "Pitching.csv"],
+              lambda stints: rollup_seasons(stints, pitching_ratios)),
+"fielding" : (["People.csv", "Fielding.csv"], rollup_seasons)}
+
+def season_frame(tables, name):
+    files, build = season_frames[name]
+    return cached_frame(name, files,
+                        lambda: build(tables[name + "_stints"]))
+
+# hall of fame and all star categories will be used for annotations to
+# differentiate players in Dash application
+# they are folded together with each player's name and career span into one
+# metadata record per player, so that building a graph title is a single
+# dict lookup instead of scanning people, HallOfFame and AllstarFull
+
+def build_player_meta(tables):
+    hallofFame = read_table("HallOfFame")
+    all_stars = read_table("AllstarFull")
+    meta = tables["people"].set_index("playerID")[
+    ["nameFirst", "nameLast", "debut", "finalGame"]].copy()
+    meta["HOF"] = meta.index.isin(
+    hallofFame.loc[hallofFame["inducted"] == "Y", "playerID"])
+    meta["all_star_games"] = all_stars["playerID"].value_counts().reindex(
+    meta.index, fill_value = 0)
+    return meta
+
+# graph title for the individual player graphs, e.g. "Joe Mauer (6)" over
+# the stat, with a star for hall of famers
+
+def player_title(data, Playerid, Stat):
+    meta = data.player_meta[Playerid]
+    return '<b>{} <b>{} {HOF} ({})</b><br>{}'.format(
+    meta["nameFirst"], meta["nameLast"], meta["all_star_games"], Stat,
+    HOF = '*' if meta["HOF"] else '')
+
+# awards will be used to color code individual graphics to show
+# seasons in which players won awards
+# only MVP, silver slugger, gold glove, and cy young are used, each one gets
+# a bit flag and the awards a player won in a season are OR'd together into
+# one small int per (player, yearID), sorted by year so that questions like
+# "who won the MVP between 1950 and 1960" are a searchsorted and a bit test
+
+award_flags = {"Most Valuable Player" : 1, "Silver Slugger" : 2,
+               "Gold Glove" : 4, "Cy Young Award" : 8}
+
+def build_award_bits(tables):
+    Awards_Players = read_table("AwardsPlayers")
+    Awards_Players = Awards_Players[
+    Awards_Players["awardID"].isin(list(award_flags))].drop_duplicates(
+    subset = ["playerID", "yearID", "awardID"])
+    Awards_Players["flags"] = Awards_Players["awardID"].astype(str).map(
+    award_flags)
+    award_bits = Awards_Players.groupby(
+    ["playerID", "yearID"], as_index = False, observed = True)["flags"].sum()
+    award_bits["flags"] = award_bits["flags"].astype("int8")
+    award_bits.insert(0, "player", player_code(tables["player_ids"],
+                                               award_bits.pop("playerID")))
+    award_bits = award_bits[award_bits["player"] >= 0]
+    return award_bits.sort_values("yearID", kind="mergesort", ignore_index=True)
+
+def award_seasons(data, award, first, last):
+    award_bits = data.award_bits
+    years = award_bits["yearID"].to_numpy()
+    start, stop = np.searchsorted(years, [first, last + 1])
+    won = (award_bits["flags"].to_numpy()[start:stop] &
+           award_flags[award]) != 0
+    codes = award_bits["player"].to_numpy()[start:stop][won]
+    return list(zip(data.player_ids.categories[codes],
+                    years[start:stop][won]))
 
 # teams will be read in and an attendance column
 # (in hundreds of thousands) will be created
 # franchises file will be used to differentiate
 # between active and inactive franchises
 
-teams = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/Teams.csv")
-teams["attendance"] = teams["attendance"] / 100000
-franchises = pd.read_csv("/Users/CookedKaleDev/Downloads/\
-baseballdatabank-2019.2/core/TeamsFranchises.csv")
-franchises = teams.merge(franchises, on = 'franchID', how = 'inner')
-franchises = franchises[franchises['active'] == 'Y']
-
-# leagues file will be used to create pivot tables where
-# stats can be aggregated and Output
-# all categories except for ERA will be aggregated by sum, ERA will be by mean
-
-leagues = teams[((teams["lgID"] == "AL") | (teams["lgID"] == "NL")) &
-(teams["yearID"] >= 1901)]
-leagues_pivot = leagues.pivot_table(
-index = ["yearID"],columns=['lgID'],aggfunc= sum)
-leagues_pivot = leagues_pivot.drop(["ERA"], axis = 1)
-leagues_pivot_era_temp = leagues.pivot_table(
-index = ["yearID"],columns=['lgID'],values = ["ERA"], aggfunc= 'mean')
-leagues_pivot = leagues_pivot.join(leagues_pivot_era_temp)
-
-# Manipulating data and utilizing list comprehensions in order to produce
-# long lists in proper format to be used for
-# Dash dropdown core components
-
-batting_drop = batting.dropna(subset=[
-'teamID' , 'playerID' , 'nameFirst', 'nameLast'])
-batting_list = [dict((('label' , ((batting_drop["nameLast"].iloc[i]) + "," +
-(batting_drop["nameFirst"].iloc[i]) + "(" +
-(batting_drop["teamID"].iloc[i]) + ")" )) ,
-('value' ,
-(batting_drop["playerID"].iloc[i])))) for i in range(len(batting_drop))]
-
-pitching_drop = pitching.dropna(subset=[
-'teamID' , 'playerID' , 'nameFirst', 'nameLast'])
-pitching_list = [dict((('label' , ((pitching_drop["nameLast"].iloc[i]) + "," +
-(pitching_drop["nameFirst"].iloc[i]) + "(" +
-(pitching_drop["teamID"].iloc[i]) + ")" )) ,
-('value' ,
-(pitching_drop["playerID"].iloc[i])))) for i in range(len(pitching_drop))]
-
-teams_drop = teams.drop_duplicates(subset=['teamID' , 'name'])
-team_list = [dict((('label' , teams_drop['name'].iloc[i]) ,
-('value' , teams_drop['teamID'].iloc[i]))) for i in range(len(teams_drop))]
-
+# (the National Association's lgID is "NA", so only empty fields are read
+# as missing)
+
+def build_teams(tables):
+    teams = read_table("Teams", keep_default_na = False, na_values = [""])
+    teams["attendance"] = teams["attendance"] / 100000
+    return teams
+
+def build_franchises(tables):
+    franchises = tables["teams"].merge(read_table("TeamsFranchises"),
+                             on = 'franchID', how = 'inner')
+    return franchises[franchises['active'] == 'Y']
+
+# League totals, one dense year x league x stat cube built from Teams in a
+# single groupby pass, covering every league in the file (NA, AA, UA, PL and
+# FL as well as the AL and NL) and every season; missing cells are NaN
+# counting stats are summed, the ratio stats are averaged weighted by what
+# they are a ratio of (ERA by outs pitched, which gives the league ERA,
+# fielding percentage by games) and park factors are plain means
+# the league graphs read a year range as a slice of the cube
+
+league_weights = {"ERA" : "IPouts", "FP" : "G"}
+league_means = ["BPF", "PPF"]
+league_skip = ["yearID", "Rank"]
+
+league_names = {"NL" : "National League", "AL" : "American League",
+                "AA" : "American Association", "UA" : "Union Association",
+                "PL" : "Players' League", "FL" : "Federal League",
+                "NA" : "National Association"}
+
+def build_league_cube(tables):
+    frame = tables["teams"].dropna(subset = ["lgID"])
+    stats = [col for col in frame.columns if col not in league_skip and
+             pd.api.types.is_numeric_dtype(frame[col])]
+    # league totals overflow the 16 bit team columns, so sum in float64
+    values = frame[stats].astype("float64")
+    parts = {}
+    for col in stats:
+        parts[col] = values[col]
+        if col in league_weights:
+            weight = values[league_weights[col]].where(values[col].notna())
+            parts[col] = values[col] * weight
+            parts[col + " weight"] = weight
+        elif col in league_means:
+            parts[col + " weight"] = values[col].notna().astype("float64")
+    keys = [frame["yearID"].to_numpy(), frame["lgID"].astype(str).to_numpy()]
+    sums = pd.DataFrame(parts).groupby(keys).sum(min_count = 1)
+    for col in stats:
+        if col + " weight" in sums.columns:
+            sums[col] = sums[col] / sums[col + " weight"].replace(0, np.nan)
+    # leagues in the order they first played
+    first_year = pd.Series(keys[0]).groupby(keys[1]).min()
+    leagues = sorted(first_year.index, key = lambda lg: (first_year[lg], lg))
+    years = np.arange(keys[0].min(), keys[0].max() + 1, dtype = "int16")
+    cube = np.full((len(years), len(leagues), len(stats)), np.nan)
+    cube[sums.index.get_level_values(0) - years[0],
+         pd.Index(leagues).get_indexer(sums.index.get_level_values(1))] = (
+    sums[stats].to_numpy())
+    return {"years" : years, "leagues" : np.array(leagues, dtype = str),
+            "stats" : np.array(stats, dtype = str), "values" : cube}
+
+def build_league_index(tables):
+    return {lg : i for i, lg in
+            enumerate(tables["league_cube"]["leagues"].tolist())}
+
+def build_league_stats(tables):
+    return {col : i for i, col in
+            enumerate(tables["league_cube"]["stats"].tolist())}
+
+def league_series(data, Lgname, Stat, Year):
+    years = data.league_cube["years"]
+    start, stop = np.searchsorted(years, [Year[0], Year[1] + 1])
+    return (years[start:stop], data.league_cube["values"][
+            start:stop, data.league_index[Lgname], data.league_stats[Stat]])
+
+# Columns for the memory mapped stores: numbers as column_array gives them,
+# and ID or flag columns as integer codes (-1 for missing) with the code's
+# labels kept apart under "labels"
+
+def shared_columns(frame):
+    columns, labels = {}, {}
+    for col in frame.columns:
+        column = frame[col]
+        if pd.api.types.is_numeric_dtype(column.dtype):
+            columns[col] = column_array(column)
+        else:
+            column = column.astype("category")
+            columns[col] = column.cat.codes.to_numpy()
+            labels[col] = column.cat.categories.to_numpy(dtype = str)
+    return columns, labels
+
+# Per-team series store used by the team callbacks
+# every Teams.csv column is laid out as a numpy array over the team's full
+# span of years, with NaN for seasons the team did not play, so that x and y
+# always line up; World Series wins and whether the team belongs to an
+# active franchise are worked out here once instead of on every request
+# all teams' spans are concatenated into one set of memory mapped arrays,
+# each team's entry holds slices of them
+
+def build_team_arrays(tables):
+    active = set(tables["franchises"]["teamID"])
+    spans, names = [], []
+    for Teamname, team in tables["teams"].groupby("teamID", sort=False,
+                                        observed=True):
+        team = team.drop_duplicates(subset=["yearID"]).set_index("yearID")
+        spans.append(team.reindex(np.arange(team.index.min(),
+                                            team.index.max() + 1)))
+        names.append(Teamname)
+    bounds = np.cumsum([0] + [len(span) for span in spans])
+    frame = pd.concat(spans)
+    columns, labels = shared_columns(frame)
+    return {"teams" : np.array(names, dtype = str),
+            "starts" : bounds[:-1], "stops" : bounds[1:],
+            "years" : frame.index.to_numpy(dtype = "int16"),
+            "columns" : columns, "labels" : labels,
+            "ws_wins" : np.add.reduceat(
+                        (frame["WSWin"] == "Y").to_numpy(dtype = int),
+                        bounds[:-1]),
+            "active" : np.isin(names, list(active))}
+
+def build_team_store(tables):
+    arrays = tables["team_arrays"]
+    store = {}
+    for Teamname, start, stop, ws_wins, active in zip(
+        arrays["teams"].tolist(), arrays["starts"], arrays["stops"],
+        arrays["ws_wins"], arrays["active"]):
+        store[Teamname] = {
+        "years": arrays["years"][start:stop],
+        "columns": {col: values[start:stop]
+                    for col, values in arrays["columns"].items()},
+        "ws_wins": int(ws_wins),
+        "active": bool(active)}
+    return store
+
+def team_title(data, Teamname, Stat, Stat2):
+    team = data.team_store[Teamname]
+    return '<b>{} {ACT} (<b>{}) </b><br>{} vs {}'.format(
+    Teamname, team["ws_wins"], Stat, Stat2,
+    ACT = '*' if team["active"] else '')
+
+# Per-player season indexes used by the individual player callbacks
+# each stat frame is sorted by player code and year once at load time so
+# that a player's seasons sit in one contiguous slice, and every column is
+# kept as a plain numpy array; a callback then only slices out that player's
+# rows instead of masking the whole frame for every season it draws
+# the slice bounds are two arrays indexed by player code, so a lookup is
+# the playerID to code dict and two array reads
+# the indexes are memory mapped from the cache (see cached_arrays)
+
+def build_season_index(frame, tables, ratios):
+    frame = frame.dropna(subset=["yearID"]).sort_values(
+    ["player", "yearID"], kind="mergesort")
+    codes = frame["player"].to_numpy()
+    bounds = np.searchsorted(codes, np.arange(len(tables["people"]) + 1))
+    columns, labels = shared_columns(frame)
+    columns["awards"] = tables["award_bits"].set_index(["player", "yearID"])[
+    "flags"].reindex(pd.MultiIndex.from_arrays(
+    [codes, columns["yearID"]]), fill_value = 0).to_numpy()
+    return {"starts": bounds[:-1], "stops": bounds[1:], "columns": columns,
+            "labels": labels, "running": running_stats(frame, ratios)}
+
+def season_index(name):
+    return lambda tables: build_season_index(season_frame(tables, name),
+                                             tables, season_ratios[name])
+
+# Career-to-date and rolling columns
+# for every counting stat of a season frame, running["career"] holds the
+# player's total through each season and running["rolling"] the per season
+# average over the player's last rolling_seasons seasons (fewer at the start
+# of a career, and only counting seasons the stat was recorded), row for row
+# with the season index; both come from a few vectorized groupby passes
+# over the frame sorted by player and year, a rolling sum being the running
+# total less the running total rolling_seasons seasons earlier
+# ratio stats are recomputed from the totals and rolling sums of their
+# components (a career BA is career hits over career at bats), ratio stats
+# without a formula are left out
+# the totals are whole numbers and kept as float32, the averages are float64
+# rounded to 2 decimals like the ratio stats (float32 thirds would reach
+# the graphs as 44.33333206176758)
+# (set LAHMAN_ROLLING_SEASONS to change the window, 3 by default)
+
+rolling_seasons = int(os.environ.get("LAHMAN_ROLLING_SEASONS", 3))
+
+def running_stats(frame, ratios):
+    stats = [col for col in frame.columns
+             if col not in ["player", "yearID", "stints"] and
+             pd.api.types.is_numeric_dtype(frame[col]) and
+             frame[col].dtype != np.float64]
+    values = frame[stats].astype("float64")
+    player = frame["player"].to_numpy()
+    totals = values.fillna(0).groupby(player).cumsum()
+    seasons = values.notna().astype("int64").groupby(player).cumsum()
+    window_sums = totals - totals.groupby(player).shift(
+                  rolling_seasons).fillna(0)
+    window_seasons = seasons - seasons.groupby(player).shift(
+                     rolling_seasons).fillna(0)
+    career = totals.where(seasons > 0)
+    rolling = window_sums.where(window_seasons > 0)
+    running = {"career" : {col : career[col].to_numpy(dtype = "float32")
+                           for col in stats},
+               "rolling" : {col : np.round(rolling[col] /
+                                           window_seasons[col], 2).to_numpy()
+                            for col in stats}}
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        for col, ratio in ratios.items():
+            for kind, sums in [("career", career), ("rolling", rolling)]:
+                running[kind][col] = ratio(sums).astype("float64").replace(
+                [np.inf, -np.inf], np.nan).to_numpy()
+    return running
+
+def player_seasons(data, index, Playerid, Stat):
+    code = data.player_codes[Playerid]
+    start, stop = index["starts"][code], index["stops"][code]
+    return (index["columns"]["yearID"][start:stop],
+            index["columns"][Stat][start:stop],
+            index["columns"]["awards"][start:stop])
+
+# several players' seasons in one lookup: the players' slice bounds are
+# gathered together, turned into one array of row numbers (each player's
+# run of rows back to back) and every column is read with a single take,
+# so the cost follows the number of seasons returned; the result is split
+# back into (years, values) per player, in the order given
+# (unknown playerIDs are skipped)
+
+compare_limit = 10
+
+def players_seasons(data, index, Playerids, Stat):
+    Playerids = [Playerid for Playerid in Playerids
+                 if Playerid in data.player_codes][:compare_limit]
+    codes = np.array([data.player_codes[Playerid] for Playerid in Playerids],
+                     dtype = np.int64)
+    starts, stops = index["starts"][codes], index["stops"][codes]
+    lengths = stops - starts
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    rows = np.arange(bounds[-1]) + np.repeat(starts - bounds[:-1], lengths)
+    years = index["columns"]["yearID"].take(rows)
+    values = index["columns"][Stat].take(rows)
+    return [(Playerid, years[start:stop], values[start:stop])
+            for Playerid, start, stop in zip(Playerids, bounds[:-1],
+                                             bounds[1:])]
+
+# Splitting a player's seasons into the bar series drawn by the player graphs
+# the stat is spread over every year of the career with 0 for years the
+# player missed, then each award's seasons are picked out by testing its bit
+# in the season's award flags and the remaining seasons (plus the missed
+# years) form the plain season series
+# returns [(Otherx, Othery), (award x, award y), ...] in the order given
+
+def season_series(years, values, flags, awards):
+    span = np.arange(years[0], years[-1] + 1)
+    played = np.zeros(len(span), dtype=bool)
+    played[years - years[0]] = True
+    full = np.zeros(len(span))
+    full[years - years[0]] = values
+    season_flags = np.zeros(len(span), dtype=flags.dtype)
+    season_flags[years - years[0]] = flags
+    masks = [(season_flags & award_flags[award]) != 0 for award in awards]
+    bits = sum(award_flags[award] for award in awards)
+    other = ~played | ((season_flags & bits) == 0)
+    return [(span[mask], full[mask]) for mask in [other] + masks]
+
+# Leaderboards
+# every season in a season index is ranked within its (year, league) and
+# within its year across the majors ("MLB", the only group for a season
+# split between leagues, lgID "ML"), and every player's career is ranked
+# too, once per stat at load time; a stat's row numbers are stored group
+# after group, best first, with each group's bounds, so a leaderboard is a
+# slice of that order and a gather of the columns it points at
+# careers sum the counting stats over the player's block of the season
+# index and recompute the ratio stats from those sums (a ratio without a
+# formula, like zone rating, has no career leaderboard)
+# rate stats only rank seasons and careers past a minimum number of at bats
+# or outs pitched, and lower is better for the pitching rates
+
+leaderboard_minimums = {"BA" : ("AB", 300, 3000),
+                        "ERA" : ("IPouts", 300, 3000),
+                        "BAOpp" : ("IPouts", 300, 3000)}
+leaderboard_ascending = ["ERA", "BAOpp"]
+leaderboard_skip = ["player", "yearID", "stints", "awards"]
+# only the stats the Batting, Pitching and Fielding dropdowns offer (the
+# Leaders tab reuses their options) are ranked, fielding games and innings
+# are summed over positions and mean little on a leaderboard
+leaderboard_stats = {"batting" : ["R", "2B", "3B", "HR", "RBI", "SB", "BA",
+                                  "CS", "BB", "SO", "IBB", "HBP", "GIDP",
+                                  "SH", "SF"],
+                     "pitching" : ["W", "L", "G", "GS", "CG", "SHO", "SV",
+                                   "ER", "HR", "SO", "BB", "BAOpp", "ERA",
+                                   "R", "BK"],
+                     "fielding" : ["PO", "A", "DP", "E", "PB", "WP", "CS",
+                                   "SB"]}
+leaderboard_limit = 25
+leaderboard_max = 100
+
+# row numbers of the members that qualify, ordered by group and then best
+# value first (ties in row order), and where each group starts
+
+def rank_groups(members, groups, count, values, qualified, ascending):
+    keep = qualified[members]
+    members, groups = members[keep], groups[keep]
+    key = values[members] if ascending else -values[members]
+    order = np.lexsort((members, key, groups))
+    return {"order" : members[order].astype("int32"),
+            "bounds" : np.searchsorted(groups[order], np.arange(count + 1))}
+
+def qualified_rows(columns, stat, season):
+    qualified = ~np.isnan(columns[stat])
+    if stat in leaderboard_minimums:
+        col, season_minimum, career_minimum = leaderboard_minimums[stat]
+        qualified &= columns[col] >= (season_minimum if season
+                                      else career_minimum)
+    return qualified
+
+def build_careers(index, ratios):
+    columns = index["columns"]
+    players = np.flatnonzero(index["stops"] > index["starts"])
+    starts = index["starts"][players]
+    careers = {"player" : players.astype("int32"),
+               "first" : columns["yearID"][starts].astype("int16"),
+               "last" : columns["yearID"][index["stops"][players] - 1
+                                          ].astype("int16")}
+    for stat, values in columns.items():
+        if (stat in leaderboard_skip or stat in index["labels"] or
+            values.dtype == np.float64):
+            continue
+        values = values.astype("float64")
+        played = np.add.reduceat(~np.isnan(values), starts)
+        careers[stat] = np.where(played > 0, np.add.reduceat(
+                                 np.nan_to_num(values), starts), np.nan)
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        for stat, ratio in ratios.items():
+            careers[stat] = np.asarray(ratio(careers), dtype = "float64")
+            careers[stat][np.isinf(careers[stat])] = np.nan
+    return careers
+
+def build_ranks(index, ratios, stats):
+    columns, labels = index["columns"], index["labels"]
+    leagues = np.append(labels["lgID"], "")[columns["lgID"]]
+    in_league = np.flatnonzero((leagues != "") & (leagues != "ML"))
+    rows = np.arange(len(leagues))
+    members = np.concatenate([in_league, rows])
+    keys = pd.MultiIndex.from_arrays(
+    [np.concatenate([columns["yearID"][in_league], columns["yearID"]]),
+     np.concatenate([leagues[in_league], np.full(len(rows), "MLB")])])
+    groups, group_keys = pd.factorize(keys, sort = True)
+    stats = [stat for stat in stats if stat in columns]
+    careers = build_careers(index, ratios)
+    return {"groups" : {"years" : group_keys.get_level_values(0).to_numpy(
+                                  dtype = "int16"),
+                        "leagues" : group_keys.get_level_values(1).to_numpy(
+                                    dtype = str)},
+            "season" : {stat : rank_groups(
+                        members, groups, len(group_keys), columns[stat],
+                        qualified_rows(columns, stat, True),
+                        stat in leaderboard_ascending) for stat in stats},
+            "careers" : careers,
+            "career" : {stat : rank_groups(
+                        np.arange(len(careers["player"])),
+                        np.zeros(len(careers["player"]), dtype = int), 1,
+                        careers[stat], qualified_rows(careers, stat, False),
+                        stat in leaderboard_ascending)["order"]
+                        for stat in stats if stat in careers}}
+
+def leaderboard_ranks(name):
+    return lambda tables: build_ranks(tables[name + "_index"],
+                                      season_ratios[name],
+                                      leaderboard_stats[name])
+
+# top players for a stat in one season and league (league "MLB" for the
+# whole majors), or over careers when year is None; players tied on the
+# value share a rank
+# careers are only ranked across the whole majors, there is no career
+# leaderboard for a single league
+
+def leaderboard(data, name, stat, year = None, league = "MLB",
+                limit = leaderboard_limit):
+    ranks = data.tables[name + "_ranks"]
+    if year is None:
+        if league != "MLB":
+            return []
+        columns = ranks["careers"]
+        rows = ranks["career"][stat][:limit]
+    else:
+        season = ranks["season"][stat]
+        groups = ranks["groups"]
+        start, stop = np.searchsorted(groups["years"], [year, year + 1])
+        leagues = groups["leagues"][start:stop].tolist()
+        if league not in leagues:
+            return []
+        group = start + leagues.index(league)
+        rows = season["order"][season["bounds"][group]:
+                               season["bounds"][group + 1]][:limit]
+        index = data.tables[name + "_index"]
+        columns, labels = index["columns"], index["labels"]
+    playerIDs = data.player_ids.categories[columns["player"][rows]]
+    values = compact_values(columns[stat][rows])
+    leaders, rank = [], 0
+    for position, (Playerid, value) in enumerate(zip(playerIDs, values)):
+        if position == 0 or value != leaders[-1][stat]:
+            rank = position + 1
+        meta = data.player_meta[Playerid]
+        leader = {"rank" : rank, "playerID" : Playerid,
+                  "name" : "{} {}".format(meta["nameFirst"],
+                                          meta["nameLast"])}
+        row = rows[position]
+        if year is None:
+            leader.update(first = int(columns["first"][row]),
+                          last = int(columns["last"][row]))
+        else:
+            league_code = columns["lgID"][row]
+            leader.update(yearID = year,
+                          teamID = labels["teamID"][columns["teamID"][row]],
+                          lgID = labels["lgID"][league_code]
+                                 if league_code >= 0 else "")
+        leader[stat] = value
+        leaders.append(leader)
+    return leaders
+
+# Player dropdowns are searched on the server instead of shipping every
+# player to the browser: each player gets one option listing every team
+# they played for, and a sorted list of lower case name keys
+# ("mauer,joe", "joe mauer", "mauer" and the playerID) is searched by prefix
+# with bisect, returning at most search_limit players per keystroke
+
+search_limit = 25
+
+def build_player_search(people, stints):
+    # names are taken from people by player code, players without a first
+    # or last name are left out of the search
+    named = people[["nameFirst", "nameLast"]].notna().all(axis = 1).to_numpy()
+    frame = stints[["player", "teamID"]].dropna()
+    frame = frame[named[frame["player"].to_numpy()]]
+    # every team a player appeared for, in order, joined with "/" by
+    # summing the "/teamID" strings over each player's block of rows
+    played_for = frame.drop_duplicates().sort_values("player",
+                                                     kind="mergesort")
+    codes = played_for["player"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    players = people.iloc[codes[starts]].set_index("playerID")
+    player_teams = pd.Series(np.add.reduceat(
+    ("/" + played_for["teamID"].astype(str)).to_numpy(), starts),
+    index = players.index)
+    labels = (players["nameLast"] + "," + players["nameFirst"] + "(" +
+              player_teams.reindex(players.index).str[1:] + ")")
+    options = {Playerid: {'label' : label, 'value' : Playerid}
+               for Playerid, label in zip(labels.index, labels.to_numpy())}
+    ids = players.index.to_series()
+    keys = pd.DataFrame({
+    "key": pd.concat([players["nameLast"] + "," + players["nameFirst"],
+                      players["nameFirst"] + " " + players["nameLast"],
+                      players["nameLast"], ids]).str.lower().to_numpy(),
+    "playerID": np.tile(ids.to_numpy(), 4)}).drop_duplicates().sort_values(
+    ["key", "playerID"])
+    return {"options": options,
+            "keys": list(zip(keys["key"], keys["playerID"])),
+            "names": keys["key"].tolist()}
+
+def search_players(search, search_value, selected):
+    # (selected is a list of players for the comparison dropdowns)
+    if not isinstance(selected, list):
+        selected = [selected]
+    found = [Playerid for Playerid in selected
+             if Playerid in search["options"]]
+    limit = search_limit + len(found)
+    if search_value:
+        prefix = search_value.strip().lower()
+        position = bisect.bisect_left(search["names"], prefix)
+        for key, Playerid in search["keys"][position:]:
+            if len(found) >= limit or not key.startswith(prefix):
+                break
+            if Playerid not in found:
+                found.append(Playerid)
+    return [search["options"][Playerid] for Playerid in found]
+
+def build_team_list(tables):
+    return tables["teams"].drop_duplicates(subset=['teamID' , 'name'])[
+    ['name', 'teamID']].rename(columns = {'name' : 'label',
+                                          'teamID' : 'value'}
+    ).to_dict('records')
+
+# Data snapshots
+# everything the callbacks read is a node of data_graph, built in the order
+# listed: how it is stored (a cached frame, a memory mapped array store, or
+# None for things cheap enough to build in memory), the csv files its cache
+# key is made from, the nodes it is built from, and its build function,
+# which is given the tables built so far
+# the built tables are wrapped in a read only Snapshot, a callback takes the
+# current snapshot once when it starts and reads every table from it, so a
+# reload swapping in a new snapshot never changes the data under a callback
+# that is already running (it finishes on the old one, which is freed once
+# nothing holds it any more)
+
+data_graph = {
+"people" : (cached_frame, ["People.csv"], [], build_people),
+"player_ids" : (None, [], ["people"], build_player_ids),
+"player_codes" : (None, [], ["player_ids"], build_player_codes),
+"batting_stints" : (cached_frame, ["People.csv", "Batting.csv"],
+                    ["player_ids"],
+                    lambda tables: read_stints("Batting",
+                                               tables["player_ids"])),
+"pitching_stints" : (cached_frame, ["People.csv", "Pitching.csv"],
+                     ["player_ids"],
+                     lambda tables: read_stints("Pitching",
+                                                tables["player_ids"])),
+"fielding_stints" : (cached_frame, ["People.csv", "Fielding.csv"],
+                     ["player_ids"],
+                     lambda tables: read_stints("Fielding",
+                                                tables["player_ids"])),
+"player_meta_frame" : (cached_frame, ["People.csv", "HallOfFame.csv",
+                                      "AllstarFull.csv"], ["people"],
+                       build_player_meta),
+"player_meta" : (None, [], ["player_meta_frame"],
+                 lambda tables: tables["player_meta_frame"].to_dict("index")),
+"award_bits" : (cached_frame, ["People.csv", "AwardsPlayers.csv"],
+                ["player_ids"], build_award_bits),
+"teams" : (cached_frame, ["Teams.csv"], [], build_teams),
+"franchises" : (cached_frame, ["Teams.csv", "TeamsFranchises.csv"],
+                ["teams"], build_franchises),
+"league_cube" : (cached_arrays, ["Teams.csv"], ["teams"], build_league_cube),
+"league_index" : (None, [], ["league_cube"], build_league_index),
+"league_stats" : (None, [], ["league_cube"], build_league_stats),
+"team_arrays" : (cached_arrays, ["Teams.csv", "TeamsFranchises.csv"],
+                 ["teams", "franchises"], build_team_arrays),
+"team_store" : (None, [], ["team_arrays"], build_team_store),
+"team_list" : (None, [], ["teams"], build_team_list),
+"batting_index" : (cached_arrays, ["People.csv", "Batting.csv",
+                                   "AwardsPlayers.csv"],
+                   ["people", "batting_stints", "award_bits"],
+                   season_index("batting")),
+"pitching_index" : (cached_arrays, ["People.csv", "Pitching.csv",
+                                    "AwardsPlayers.csv"],
+                    ["people", "pitching_stints", "award_bits"],
+                    season_index("pitching")),
+"fielding_index" : (cached_arrays, ["People.csv", "Fielding.csv",
+                                    "AwardsPlayers.csv"],
+                    ["people", "fielding_stints", "award_bits"],
+                    season_index("fielding")),
+"batting_ranks" : (cached_arrays, ["People.csv", "Batting.csv",
+                                   "AwardsPlayers.csv"], ["batting_index"],
+                   leaderboard_ranks("batting")),
+"pitching_ranks" : (cached_arrays, ["People.csv", "Pitching.csv",
+                                    "AwardsPlayers.csv"], ["pitching_index"],
+                    leaderboard_ranks("pitching")),
+"fielding_ranks" : (cached_arrays, ["People.csv", "Fielding.csv",
+                                    "AwardsPlayers.csv"], ["fielding_index"],
+                    leaderboard_ranks("fielding")),
+"batting_search" : (None, [], ["people", "batting_stints"],
+                    lambda tables: build_player_search(
+                    tables["people"], tables["batting_stints"])),
+"pitching_search" : (None, [], ["people", "pitching_stints"],
+                     lambda tables: build_player_search(
+                     tables["people"], tables["pitching_stints"])),
+}
+
+data_files = sorted({name for _, files, _, _ in data_graph.values()
+                     for name in files})
+
+class Snapshot:
+
+    def __init__(self, version, sources, tables, rebuilt):
+        self.__dict__.update(tables, version = version, sources = sources,
+                             tables = tables, rebuilt = rebuilt)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("data snapshots are read only")
+
+# size and modification time of every source csv, and a short version
+# string made from them (the same in every worker process)
+
+def source_stats():
+    sources = {}
+    for name in data_files:
+        stat = os.stat(os.path.join(data_path, name))
+        sources[name] = (stat.st_size, stat.st_mtime_ns)
+    return sources
+
+def data_version(sources):
+    return hashlib.md5(repr(sorted(sources.items())).encode()
+                       ).hexdigest()[:12]
+
+# builds a snapshot, given the previous one only the nodes whose csv files
+# changed and the nodes built from those are rebuilt (through the same
+# caches as at startup), the rest are shared with the previous snapshot
+
+def load_snapshot(previous = None):
+    sources = source_stats()
+    changed = {name for name in data_files if previous is None or
+               previous.sources.get(name) != sources[name]}
+    tables, rebuilt = {}, []
+    for name, (store, files, deps, build) in data_graph.items():
+        if (previous is not None and changed.isdisjoint(files) and
+            not any(dep in rebuilt for dep in deps)):
+            tables[name] = previous.tables[name]
+            continue
+        rebuilt.append(name)
+        if store is None:
+            with startup_profile.phase(name):
+                tables[name] = build(tables)
+        else:
+            tables[name] = store(name, files,
+                                 functools.partial(build, tables))
+    return Snapshot(data_version(sources), sources, tables, rebuilt)
+
+# Hot reload of the data directory
+# with LAHMAN_RELOAD_SECONDS above 0 (the default is 60) every serving
+# process polls the source csv files from a background thread started on
+# its first request; once a changed file has kept the same size and
+# modification time for a whole interval (so a release still being copied
+# in is not read half written) a new snapshot is loaded next to the current
+# one and swapped in with a single assignment, and every function
+# registered with on_swap is called with it (the figure cache and the
+# components built from the data); a snapshot that fails to load is
+# reported and the current one kept until the files change again
+# (replacing a file with a rename, e.g. rsync, avoids the settling delay
+# being needed at all)
+
+reload_seconds = float(os.environ.get("LAHMAN_RELOAD_SECONDS", 60))
+
+class DataManager:
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.snapshot = load_snapshot()
+        self.listeners = []
+        self.reloads = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+        self.watcher = None
+
+    def on_swap(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def reload(self):
+        with self.lock:
+            previous = self.snapshot
+            snapshot = load_snapshot(previous)
+            self.snapshot = snapshot
+            self.reloads += 1
+        for listener in self.listeners:
+            listener(snapshot)
+        print("data version {} loaded from {} (rebuilt {})".format(
+        snapshot.version, data_path, ", ".join(snapshot.rebuilt) or "nothing"),
+        flush = True)
+        return snapshot
+
+    # the watcher thread is started lazily so that each process forked by
+    # a preloading server (threads do not survive a fork) starts its own
+
+    def watch(self):
+        if self.interval <= 0 or self.watcher == os.getpid():
+            return
+        with self.lock:
+            if self.watcher == os.getpid():
+                return
+            self.watcher = os.getpid()
+        threading.Thread(target = self.run, name = "lahman-data-watcher",
+                         daemon = True).start()
+
+    def run(self):
+        seen = failed = self.snapshot.sources
+        while True:
+            time.sleep(self.interval)
+            try:
+                sources = source_stats()
+            except OSError:
+                # a file is being replaced, look again next time
+                continue
+            settled, seen = sources == seen, sources
+            if not settled or sources in (self.snapshot.sources, failed):
+                continue
+            try:
+                self.reload()
+            except Exception as error:
+                self.failures += 1
+                failed = sources
+                warnings.warn("reloading {} failed, keeping data version "
+                              "{}: {!r}".format(data_path,
+                                                self.snapshot.version, error))
+
+data_manager = DataManager(reload_seconds)
+
+@server.before_request
+def watch_data():
+    data_manager.watch()
+
+
+# Optional startup report of how much memory each loaded frame takes, next
+# to what it would take with read_csv's default dtypes
+# (set LAHMAN_MEMORY_REPORT=1 to print it)
+
+def memory_report(frames):
+    print("{:<18}{:>14}{:>14}{:>8}".format(
+    "frame", "default MB", "compact MB", "saved"))
+    total_default = total_compact = 0
+    for name, frame in frames.items():
+        compact = frame_bytes(frame)
+        default = frame_bytes(default_dtypes(frame))
+        total_default += default
+        total_compact += compact
+        print("{:<18}{:>14.1f}{:>14.1f}{:>7.0%}".format(
+        name, default / 2**20, compact / 2**20, 1 - compact / default))
+    print("{:<18}{:>14.1f}{:>14.1f}{:>7.0%}".format(
+    "total", total_default / 2**20, total_compact / 2**20,
+    1 - total_compact / total_default))
+
+if os.environ.get("LAHMAN_MEMORY_REPORT"):
+    tables = data_manager.snapshot.tables
+    memory_report({"people" : tables["people"],
+                   "batting_stints" : tables["batting_stints"],
+                   "pitching_stints" : tables["pitching_stints"],
+                   "fielding_stints" : tables["fielding_stints"],
+                   "batting" : season_frame(tables, "batting"),
+                   "pitching" : season_frame(tables, "pitching"),
+                   "fielding" : season_frame(tables, "fielding"),
+                   "award_bits" : tables["award_bits"],
+                   "teams" : tables["teams"],
+                   "franchises" : tables["franchises"]})
 
 # Defining all of our Dash core components (DCC)
 
+startup_profile.begin("components_and_layout")
+
 
 Footnote = dcc.Markdown(dedent('''
                         _* - Denotes Hall of Fame Inductee_
@@ -150,6 +1290,17 @@ baseball-archive/statistics/)
                                        '''), style = {"text-align" : "center"})
 
 Footnote_League = dcc.Markdown(dedent('''
+Data Source - [Lahman's Baseball Database](http://www.seanlahman.com/\
+baseball-archive/statistics/)
+                                       '''), style = {"text-align" : "center"})
+
+Footnote_Leaders = dcc.Markdown(dedent('''
+                        _Batting average needs 300 at bats in a season (3000
+                        over a career), ERA and opponent batting average 100
+                        innings pitched (1000 over a career); careers are
+                        ranked across the whole majors whatever the league_
+
+
 Data Source - [Lahman's Baseball Database](http://www.seanlahman.com/\
 baseball-archive/statistics/)
                                        '''), style = {"text-align" : "center"})
@@ -160,6 +1311,41 @@ Stats_Graph_Pitch = dcc.Graph(id="STATS_GRAPH_PITCH")
 
 Stats_Graph_Field = dcc.Graph(id="STATS_GRAPH_FIELD")
 
+Compare_Graph_Bat = dcc.Graph(id="COMPARE_GRAPH_BAT")
+
+Compare_Graph_Pitch = dcc.Graph(id="COMPARE_GRAPH_PITCH")
+
+Compare_Graph_Field = dcc.Graph(id="COMPARE_GRAPH_FIELD")
+
+# comparison graphs line players up by calendar year or by season of
+# their careers (the first season listed being season 1)
+
+# the running columns drawn as a line over a player's season bars
+
+Overlay_Radio = dcc.RadioItems(
+                     id = "RADIO_OVERLAY",
+                     options = [
+                     {'label': "Seasons Only", 'value': "none"},
+                     {'label': "Career Total", 'value': "career"},
+                     {'label': "{}-Season Average".format(rolling_seasons),
+                      'value': "rolling"}
+                               ],
+                     value = "none",
+                     labelStyle = {'display' : 'inline-block',
+                                   'color' : 'white', 'marginRight' : 20}
+                            )
+
+Align_Radio = dcc.RadioItems(
+                     id = "RADIO_ALIGN",
+                     options = [
+                     {'label': "Calendar Year", 'value': "year"},
+                     {'label': "Season of Career", 'value': "career"}
+                               ],
+                     value = "year",
+                     labelStyle = {'display' : 'inline-block',
+                                   'color' : 'white', 'marginRight' : 20}
+                            )
+
 Stats_Graph_Bat_Team = dcc.Graph(id="STATS_GRAPH_BAT_TEAM")
 
 Stats_Graph_Pitch_Team = dcc.Graph(id="STATS_GRAPH_PITCH_TEAM")
@@ -172,10 +1358,29 @@ Stats_Graph_Pitch_League = dcc.Graph(id="STATS_GRAPH_PITCH_LEAGUE")
 
 Stats_Graph_Field_League = dcc.Graph(id="STATS_GRAPH_FIELD_LEAGUE")
 
+# leaderboard tables, the columns are set with the data by the callbacks
+
+leaders_table_style = dict(
+                   style_header = {'backgroundColor' : 'rgb(040,140,210)',
+                                   'color' : 'white', 'fontWeight' : 'bold'},
+                   style_cell = {'backgroundColor' : 'black',
+                                 'color' : 'white', 'textAlign' : 'left'},
+                   style_as_list_view = True)
+
+Leaders_Table_Bat = dash_table.DataTable(id="LEADERS_TABLE_BAT",
+                                         **leaders_table_style)
+
+Leaders_Table_Pitch = dash_table.DataTable(id="LEADERS_TABLE_PITCH",
+                                           **leaders_table_style)
+
+Leaders_Table_Field = dash_table.DataTable(id="LEADERS_TABLE_FIELD",
+                                           **leaders_table_style)
+
 Tabs_Main = dcc.Tabs(id="TABS_MAIN", value='tab-player', children=[
                 dcc.Tab(label='Individual Player Stats', value='tab-player'),
                 dcc.Tab(label='Team Stats', value='tab-team'),
-                dcc.Tab(label='League Stats', value='tab-league')
+                dcc.Tab(label='League Stats', value='tab-league'),
+                dcc.Tab(label='Leaders', value='tab-leaders')
                                                                  ]
                     )
 
@@ -200,6 +1405,16 @@ Tabs_League = dcc.Tabs(id="TABS_LEAGUE", value='tab-bat-league', children=[
                                                                          ]
                        )
 
+Tabs_Leaders = dcc.Tabs(id="TABS_LEADERS", value='tab-bat-leaders', children=[
+                      dcc.Tab(label='Batting Leaders',
+                              value='tab-bat-leaders'),
+                      dcc.Tab(label='Pitching Leaders',
+                              value='tab-pitch-leaders'),
+                      dcc.Tab(label='Fielding Leaders',
+                              value='tab-field-leaders')
+                                                                         ]
+                       )
+
 Batting_Stats_Dropdown = dcc.Dropdown(
                            id = "DROPDOWN_STATS",
                            options = [
@@ -335,73 +1550,128 @@ Team_Stats_Dropdown = dcc.Dropdown(
                                 value = "W"
                                          )
 
+# the leaderboards offer the same stats as the player graphs
 
+Batting_Stats_Dropdown_Leaders = dcc.Dropdown(
+                                id = "DROPDOWN_STATS_BAT_LEADERS",
+                                options = Batting_Stats_Dropdown.options,
+                                value = "HR"
+                                         )
 
-rangeslider_year_league = dcc.RangeSlider(
+Pitching_Stats_Dropdown_Leaders = dcc.Dropdown(
+                                id = "DROPDOWN_STATS_PITCH_LEADERS",
+                                options = Pitching_Stats_Dropdown.options,
+                                value = "ERA"
+                                         )
+
+Fielding_Stats_Dropdown_Leaders = dcc.Dropdown(
+                                id = "DROPDOWN_STATS_FIELD_LEADERS",
+                                options = Fielding_Stats_Dropdown.options,
+                                value = "E"
+                                         )
+
+
+
+# the components whose options come from the data are built from a
+# snapshot, and built again whenever a new one is swapped in (the tab
+# callbacks always hand out the latest ones)
+
+def data_components(data):
+    global rangeslider_year_league, player_dropdown
+    global player_dropdown_pitchers, teams_dropdown, league_dropdown
+    global year_dropdown_leaders, league_dropdown_leaders
+    global compare_dropdown, compare_dropdown_pitchers
+
+    years = data.league_cube["years"]
+
+    rangeslider_year_league = dcc.RangeSlider(
                                 id="RANGESLIDER_YEAR_LEAGUE",
-                                marks = {1910 : {'label': '1910',
-                                         'style':{'color':'white'}},
-                                         1920 : {'label': '1920',
-                                         'style':{'color':'white'}},
-                                         1930 : {'label': '1930',
-                                         'style':{'color':'white'}},
-                                         1940 : {'label': '1940',
-                                         'style':{'color':'white'}},
-                                         1950 : {'label': '1950',
-                                         'style':{'color':'white'}},
-                                         1960 : {'label': '1960',
-                                         'style':{'color':'white'}},
-                                         1970 : {'label': '1970',
-                                         'style':{'color':'white'}},
-                                         1980 : {'label': '1980',
-                                         'style':{'color':'white'}},
-                                         1990 : {'label': '1990',
-                                         'style':{'color':'white'}},
-                                         2000 : {'label': '2000',
-                                         'style':{'color':'white'}},
-                                         2010 : {'label': '2010',
-                                         'style':{'color':'white'}},
-                                         },
-                                min   = leagues_pivot.index.min(),
-                                max   = leagues_pivot.index.max(),
+                                marks = {decade : {'label': str(decade),
+                                         'style':{'color':'white'}}
+                                         for decade in range(
+                                         (int(years[0]) + 9) // 10 * 10,
+                                         int(years[-1]) + 1, 10)},
+                                min   = int(years[0]),
+                                max   = int(years[-1]),
                                 step  = 1,
-                                value = [ leagues_pivot.index.min() ,
-                                          leagues_pivot.index.max() ]
+                                value = [ int(years[0]) , int(years[-1]) ]
                                )
 
-player_dropdown = dcc.Dropdown(
+    player_dropdown = dcc.Dropdown(
                                  id = "DROPDOWN_PLAYER",
-                                 options = batting_list,
+                                 options = search_players(data.batting_search,
+                                                          None, "mauerjo01"),
                                  value = "mauerjo01",
                                )
 
 
-player_dropdown_pitchers = dcc.Dropdown(
+    player_dropdown_pitchers = dcc.Dropdown(
                                  id = "DROPDOWN_PLAYER_PITCH",
-                                 options = pitching_list,
+                                 options = search_players(data.pitching_search,
+                                                          None, "clemero02"),
                                  value = "clemero02"
                                )
 
 
-teams_dropdown = dcc.Dropdown(
+    teams_dropdown = dcc.Dropdown(
                        id = "DROPDOWN_TEAM",
-                       options = team_list,
+                       options = data.team_list,
                        value = "MIN"
                               )
 
 
-league_dropdown = dcc.Dropdown(
+    league_dropdown = dcc.Dropdown(
                         id = "DROPDOWN_LEAGUE",
                         options = [
+                           {'label': league_names.get(lg, lg), 'value': lg}
+                           for lg in data.league_index] + [
+                           {'label': "Both Leagues", 'value': "Both"}],
+                        value = "Both"
+                                 )
 
-                           {'label': "National League", 'value': "NL"},
-                           {'label': "American League", 'value': "AL"},
-                           {'label': "Both Leagues", 'value': "Both"},
 
-                                  ],
-                        value = "Both"
+    compare_dropdown = dcc.Dropdown(
+                                 id = "DROPDOWN_COMPARE",
+                                 options = search_players(data.batting_search,
+                                                          None, ["mauerjo01"]),
+                                 value = ["mauerjo01"],
+                                 multi = True,
+                                 placeholder = "Add up to {} players".format(
+                                               compare_limit)
+                               )
+
+
+    compare_dropdown_pitchers = dcc.Dropdown(
+                                 id = "DROPDOWN_COMPARE_PITCH",
+                                 options = search_players(data.pitching_search,
+                                                          None, ["clemero02"]),
+                                 value = ["clemero02"],
+                                 multi = True,
+                                 placeholder = "Add up to {} players".format(
+                                               compare_limit)
+                               )
+
+
+    year_dropdown_leaders = dcc.Dropdown(
+                        id = "DROPDOWN_YEAR_LEADERS",
+                        options = [{'label': "Career", 'value': "Career"}] + [
+                           {'label': str(year), 'value': year}
+                           for year in years[::-1].tolist()],
+                        value = int(years[-1])
                                  )
 
+
+    league_dropdown_leaders = dcc.Dropdown(
+                        id = "DROPDOWN_LEAGUE_LEADERS",
+                        options = [{'label': "All of MLB", 'value': "MLB"}] + [
+                           {'label': league_names.get(lg, lg), 'value': lg}
+                           for lg in data.league_index],
+                        value = "MLB"
+                                 )
+
+data_components(data_manager.snapshot)
+data_manager.on_swap(data_components)
+
 # Building the app layout
 
 app.layout = html.Div(
@@ -419,8 +1689,338 @@ app.layout = html.Div(
 
                        ])
 
+# Compact encoding of the callback payloads
+# a plotly figure carries the whole default template, with styling for
+# every trace type and for polar, geo, 3d and map subplots, in every
+# response; only the styling of the trace types in the figure and of the
+# 2d axes is kept, which renders exactly the same for these bar charts
+# numbers are written without the float ".0" for whole values and NaN as
+# null (trace arrays stay plain JSON lists, the base64 typed arrays newer
+# plotly.js versions read are not understood by the one bundled with Dash)
+# payloads over FIGURE_PAYLOAD_WARN_BYTES raise a warning so that a figure
+# growing back to its old size does not go unnoticed, and the tests check
+# the sizes of representative figures (tests/test_payload_size.py)
+
+figure_payload_warn_bytes = int(os.environ.get("FIGURE_PAYLOAD_WARN_BYTES",
+                                               16 * 2**10))
+
+template_layout_keys = ["autotypenumbers", "colorway", "font", "hovermode",
+                        "hoverlabel", "paper_bgcolor", "plot_bgcolor",
+                        "title", "xaxis", "yaxis"]
+
+def compact_values(values):
+    values = np.asarray(values)
+    if values.dtype.kind not in "iuf":
+        return [compact_json(value) for value in values.tolist()]
+    if values.dtype.kind == "f":
+        finite = np.isfinite(values)
+        whole = np.array_equal(values[finite], np.round(values[finite]))
+        values = np.where(finite, values, 0)
+        values = (values.astype(np.int64) if whole else values).astype(object)
+        values[~finite] = None
+    return values.tolist()
+
+def compact_json(value):
+    if isinstance(value, dict):
+        return {key : compact_json(item) for key, item in value.items()}
+    if isinstance(value, (np.ndarray, pd.Series, pd.Index)):
+        return compact_values(value)
+    if isinstance(value, (list, tuple)):
+        return [compact_json(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+def compact_figure(figure):
+    figure = figure.to_plotly_json()
+    layout = figure["layout"]
+    template = layout.get("template")
+    if template:
+        layout["template"] = {
+        "data" : {trace["type"] : template["data"][trace["type"]]
+                  for trace in figure["data"]
+                  if trace["type"] in template.get("data", {})},
+        "layout" : {key : template["layout"][key]
+                    for key in template_layout_keys
+                    if key in template.get("layout", {})}}
+    return {"data" : compact_json(figure["data"]),
+            "layout" : compact_json(layout)}
+
+def encode_payload(output_id, result):
+    if isinstance(result, go.Figure):
+        result = compact_figure(result)
+    payload = json.dumps(compact_json(result), separators = (",", ":"),
+                         allow_nan = False)
+    if len(payload) > figure_payload_warn_bytes:
+        warnings.warn("{} payload is {} bytes (warning threshold {})".format(
+                      output_id, len(payload), figure_payload_warn_bytes))
+    return payload
+
+# Callback metrics, served in the Prometheus text format on /metrics
+# every /_dash-update-component request is timed and its response size
+# recorded under the id of the component it updates (STATS_GRAPH_BAT,
+# TABS_DISPLAY_TEAM, ...), and the graph callbacks also record how long
+# building and encoding the figure took and whether it came from the figure
+# cache; histograms are plain bucket counts behind one lock, so recording
+# costs a few microseconds per request
+# (each worker process keeps its own metrics)
+
+seconds_buckets = [.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1,
+                   2.5, 5, 10]
+bytes_buckets = [256, 1024, 4096, 16384, 65536, 262144, 1048576]
+
+metric_help = {
+"dash_callback_seconds" : "Time to answer a callback request",
+"dash_callback_response_bytes" : "Size of the callback response body",
+"dash_callback_build_seconds" : "Time building a figure on a cache miss",
+"dash_callback_encode_seconds" : "Time encoding a figure on a cache miss",
+"dash_callback_cache_hits_total" : "Figures served from the figure cache",
+"dash_callback_cache_misses_total" : "Figures built for the figure cache",
+"dash_callback_errors_total" : "Callback requests answered with a 5xx"}
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+class CallbackMetrics:
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name, output_id, value, buckets = seconds_buckets):
+        with self.lock:
+            histogram = self.histograms.get((name, output_id))
+            if histogram is None:
+                histogram = self.histograms[name, output_id] = Histogram(
+                            buckets)
+            histogram.observe(value)
+
+    def count(self, name, output_id):
+        with self.lock:
+            self.counters[name, output_id] = self.counters.get(
+            (name, output_id), 0) + 1
+
+    def render(self):
+        lines = []
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+            names = sorted({name for name, _ in self.histograms} |
+                           {name for name, _ in self.counters})
+            for name in names:
+                lines.append("# HELP {} {}".format(name,
+                                                   metric_help.get(name, "")))
+                lines.append("# TYPE {} {}".format(name, "counter"
+                             if name.endswith("_total") else "histogram"))
+                for (metric, output_id), value in counters:
+                    if metric == name:
+                        lines.append('{}{{output="{}"}} {}'.format(
+                        name, output_id, value))
+                for (metric, output_id), histogram in histograms:
+                    if metric != name:
+                        continue
+                    total = 0
+                    for bound, count in zip(histogram.buckets + ["+Inf"],
+                                            histogram.counts):
+                        total += count
+                        lines.append(
+                        '{}_bucket{{output="{}",le="{}"}} {}'.format(
+                        name, output_id, bound, total))
+                    lines.append('{}_sum{{output="{}"}} {}'.format(
+                    name, output_id, histogram.sum))
+                    lines.append('{}_count{{output="{}"}} {}'.format(
+                    name, output_id, total))
+        return "\n".join(lines) + "\n"
+
+callback_metrics = CallbackMetrics()
+
+def callback_output_id():
+    if flask.request.path.endswith("/_dash-update-component"):
+        body = flask.request.get_json(silent = True) or {}
+        return str(body.get("output", "")).strip(".").split(".")[0]
+    return None
+
+@server.before_request
+def start_callback_timer():
+    flask.g.callback_start = time.perf_counter()
+
+@server.after_request
+def record_callback_metrics(response):
+    output_id = callback_output_id()
+    if output_id:
+        callback_metrics.observe("dash_callback_seconds", output_id,
+                                 time.perf_counter() - flask.g.callback_start)
+        callback_metrics.observe("dash_callback_response_bytes", output_id,
+                                 response.calculate_content_length() or 0,
+                                 bytes_buckets)
+        if response.status_code >= 500:
+            callback_metrics.count("dash_callback_errors_total", output_id)
+    return response
+
+@server.route("/metrics")
+def metrics():
+    cache = figure_cache.stats()
+    lines = [callback_metrics.render()]
+    for name, kind, value in [
+        ("dash_figure_cache_entries", "gauge", cache["entries"]),
+        ("dash_figure_cache_bytes", "gauge", cache["bytes"]),
+        ("dash_figure_cache_evictions_total", "counter", cache["evictions"]),
+        ("lahman_data_reloads_total", "counter", data_manager.reloads),
+        ("lahman_data_reload_failures_total", "counter",
+         data_manager.failures)]:
+        lines.append("# TYPE {} {}\n{} {}\n".format(name, kind, name, value))
+    lines.append('# TYPE lahman_data_info gauge\nlahman_data_info'
+                 '{{version="{}"}} 1\n'.format(data_manager.snapshot.version))
+    return flask.Response("".join(lines),
+                          mimetype = "text/plain; version=0.0.4")
+
+# Leaderboard API
+#     /api/leaders/batting?stat=HR&year=1998&league=NL&limit=10
+# without a year the leaderboard is over careers, the league defaults to the
+# whole majors ("MLB") and limit to leaderboard_limit (at most
+# leaderboard_max); an unknown table or stat is a 404, and a year or limit
+# that is not a whole number, or a league other than "MLB" without a year, a
+# 400 (careers are only ranked across the majors)
+
+@server.route("/api/leaders/<name>")
+def leaders_api(name):
+    args = flask.request.args
+    data = data_manager.snapshot
+    stat = args.get("stat", "")
+    league = args.get("league", "MLB")
+    if name not in season_ratios:
+        return flask.jsonify(error = "unknown table " + name), 404
+    try:
+        year = int(args["year"]) if "year" in args else None
+        limit = int(args.get("limit", leaderboard_limit))
+    except ValueError:
+        return flask.jsonify(error = "year and limit must be whole "
+                             "numbers"), 400
+    limit = min(max(limit, 0), leaderboard_max)
+    if year is None and league != "MLB":
+        return flask.jsonify(error = "career leaderboards are for the whole "
+                             "majors, league must be MLB or a year given"), 400
+    try:
+        leaders = leaderboard(data, name, stat, year, league, limit)
+    except KeyError:
+        return flask.jsonify(error = "no {} leaderboard for {}".format(
+                             "career" if year is None else "season",
+                             stat)), 404
+    return flask.jsonify(table = name, stat = stat, year = year,
+                         league = league, version = data.version,
+                         leaders = leaders)
+
+# Figure cache shared by all of the graph callbacks
+# a figure only depends on the callback, its inputs and the data snapshot it
+# was built from; finished figures are kept as serialized JSON in a least
+# recently used cache bounded by both entry count and total bytes, so that
+# a hit skips building and plotly-serializing the figure
+# keys carry the snapshot's data version, so a figure built from the old
+# data by a callback still running across a reload is never served for the
+# new one, and the cache is emptied when a new snapshot is swapped in
+
+figure_cache_entries = int(os.environ.get("FIGURE_CACHE_ENTRIES", 4096))
+figure_cache_bytes = int(os.environ.get("FIGURE_CACHE_BYTES", 128 * 2**20))
+
+class FigureCache:
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            payload = self.entries.get(key)
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return payload
+
+    def put(self, key, payload):
+        if len(payload) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= len(self.entries.pop(key))
+            self.entries[key] = payload
+            self.bytes += len(payload)
+            while (len(self.entries) > self.max_entries or
+                   self.bytes > self.max_bytes):
+                self.bytes -= len(self.entries.popitem(last=False)[1])
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.bytes,
+                    "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+    # decorator for a graph callback, cached under the callback's output id,
+    # the data version and its inputs (the range slider's list of years is
+    # made hashable); the callback is called with the current snapshot
+    # ahead of its inputs
+
+    def memoize(self, output_id):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                data = data_manager.snapshot
+                key = (output_id, data.version) + tuple(
+                tuple(arg) if isinstance(arg, list) else arg for arg in args)
+                payload = self.get(key)
+                if payload is None:
+                    start = time.perf_counter()
+                    result = func(data, *args)
+                    built = time.perf_counter()
+                    payload = encode_payload(output_id, result)
+                    callback_metrics.observe("dash_callback_build_seconds",
+                                             output_id, built - start)
+                    callback_metrics.observe("dash_callback_encode_seconds",
+                                             output_id,
+                                             time.perf_counter() - built)
+                    callback_metrics.count("dash_callback_cache_misses_total",
+                                           output_id)
+                    self.put(key, payload)
+                else:
+                    callback_metrics.count("dash_callback_cache_hits_total",
+                                           output_id)
+                return json.loads(payload)
+            return wrapper
+        return decorator
+
+figure_cache = FigureCache(figure_cache_entries, figure_cache_bytes)
+data_manager.on_swap(lambda data: figure_cache.clear())
+
+startup_profile.end()
+
 # Setting up app callbacks
 
+startup_profile.begin("callbacks")
+
 # call back for which main tab is selected (players, teams, or leagues)
 # and returning that tab's content and layout
 
@@ -443,6 +2043,11 @@ def render_content(tab_main):
                   html.Div([Tabs_League]),
                   html.Div(id="TABS_DISPLAY_LEAGUE"),
                            ])
+    elif tab_main == 'tab-leaders':
+         return   html.Div([
+                  html.Div([Tabs_Leaders]),
+                  html.Div(id="TABS_DISPLAY_LEADERS"),
+                           ])
 
 # Callbacks for individual players
 
@@ -463,6 +2068,16 @@ def render_content(tab):
                   Stats_Graph_Bat
                   ], style={'marginTop': 25},
                      id="GRAPH_CONTAINER_BAT"),
+            html.Div([Overlay_Radio],id="RADIO_OVERLAY_CONTAINER"),
+            dcc.Store(id="PLAYER_BUNDLE_BAT"),
+            html.H3('COMPARE PLAYERS', style = {"text-align" : "center" ,
+            'color' : 'white', 'font' : 'Cursive'},),
+            html.Div([compare_dropdown],id="DROP_DOWN_COMPARE"),
+            html.Div([Align_Radio],id="RADIO_ALIGN_CONTAINER"),
+            html.Div([
+                  Compare_Graph_Bat
+                  ], style={'marginTop': 25},
+                     id="GRAPH_CONTAINER_COMPARE_BAT"),
             html.Div([Footnote], style = {"text-align" : "center" ,
             'color' : 'white'}, id="FOOTNOTE"),
         ])
@@ -476,6 +2091,16 @@ def render_content(tab):
                   Stats_Graph_Pitch
                   ], style={'marginTop': 25},
                      id="GRAPH_CONTAINER_PITCH"),
+            html.Div([Overlay_Radio],id="RADIO_OVERLAY_CONTAINER"),
+            dcc.Store(id="PLAYER_BUNDLE_PITCH"),
+            html.H3('COMPARE PLAYERS', style = {"text-align" : "center" ,
+            'color' : 'white', 'font' : 'Cursive'},),
+            html.Div([compare_dropdown_pitchers],id="DROP_DOWN_COMPARE"),
+            html.Div([Align_Radio],id="RADIO_ALIGN_CONTAINER"),
+            html.Div([
+                  Compare_Graph_Pitch
+                  ], style={'marginTop': 25},
+                     id="GRAPH_CONTAINER_COMPARE_PITCH"),
             html.Div([Footnote], style = {"text-align" : "center" ,
             'color' : 'white'}, id="FOOTNOTE"),
         ])
@@ -489,67 +2114,133 @@ def render_content(tab):
                   Stats_Graph_Field
                   ], style={'marginTop': 25},
                      id="GRAPH_CONTAINER_FIELD"),
+            html.Div([Overlay_Radio],id="RADIO_OVERLAY_CONTAINER"),
+            dcc.Store(id="PLAYER_BUNDLE_FIELD"),
+            html.H3('COMPARE PLAYERS', style = {"text-align" : "center" ,
+            'color' : 'white', 'font' : 'Cursive'},),
+            html.Div([compare_dropdown],id="DROP_DOWN_COMPARE"),
+            html.Div([Align_Radio],id="RADIO_ALIGN_CONTAINER"),
+            html.Div([
+                  Compare_Graph_Field
+                  ], style={'marginTop': 25},
+                     id="GRAPH_CONTAINER_COMPARE_FIELD"),
             html.Div([Footnote], style = {"text-align" : "center" ,
             'color' : 'white'}, id="FOOTNOTE"),
         ])
 
+# search as you type for the player dropdowns, only the players matching
+# what has been typed so far (plus the current selection) are sent back
+
+@app.callback(Output("DROPDOWN_PLAYER", "options"),
+              [Input("DROPDOWN_PLAYER", "search_value")],
+              [State("DROPDOWN_PLAYER", "value")])
+def search_batters(search_value, Playerid):
+    if not search_value:
+        raise PreventUpdate
+    return search_players(data_manager.snapshot.batting_search,
+                          search_value, Playerid)
+
+@app.callback(Output("DROPDOWN_PLAYER_PITCH", "options"),
+              [Input("DROPDOWN_PLAYER_PITCH", "search_value")],
+              [State("DROPDOWN_PLAYER_PITCH", "value")])
+def search_pitchers(search_value, Playerid):
+    if not search_value:
+        raise PreventUpdate
+    return search_players(data_manager.snapshot.pitching_search,
+                          search_value, Playerid)
+
+@app.callback(Output("DROPDOWN_COMPARE", "options"),
+              [Input("DROPDOWN_COMPARE", "search_value")],
+              [State("DROPDOWN_COMPARE", "value")])
+def search_compared_batters(search_value, Playerids):
+    if not search_value:
+        raise PreventUpdate
+    return search_players(data_manager.snapshot.batting_search,
+                          search_value, Playerids or [])
+
+@app.callback(Output("DROPDOWN_COMPARE_PITCH", "options"),
+              [Input("DROPDOWN_COMPARE_PITCH", "search_value")],
+              [State("DROPDOWN_COMPARE_PITCH", "value")])
+def search_compared_pitchers(search_value, Playerids):
+    if not search_value:
+        raise PreventUpdate
+    return search_players(data_manager.snapshot.pitching_search,
+                          search_value, Playerids or [])
+
+# Player graphs are either built on the server for every (player, stat)
+# pair, or, with CLIENTSIDE_STATS=1, drawn in the browser: picking a player
+# then sends one bundle with all of that player's seasons into the tab's
+# dcc.Store and switching the stat only re-renders the bars clientside,
+# without a request to the server
+
+clientside_stats = os.environ.get("CLIENTSIDE_STATS", "") not in ("", "0")
+
+def player_graph(graph_id, player_id, stats_id):
+    def decorator(func):
+        if clientside_stats:
+            return func
+        return app.callback(Output(graph_id, "figure"),
+                            [Input(player_id, "value"),
+                             Input(stats_id, "value"),
+                             Input("RADIO_OVERLAY", "value")])(
+                            figure_cache.memoize(graph_id)(func))
+    return decorator
+
+# the career total or rolling average of the stat, as a line over the
+# season bars at the seasons played, read from the season index's running
+# columns (career totals get their own axis on the right)
+
+overlay_names = {"career" : "Career Total",
+                 "rolling" : "{}-Season Average".format(rolling_seasons)}
+
+def player_overlay(data, index, figure, Playerid, Stat, Overlay):
+    running = index["running"].get(Overlay, {})
+    if Stat not in running:
+        return figure
+    code = data.player_codes[Playerid]
+    rows = slice(index["starts"][code], index["stops"][code])
+    career = Overlay == "career"
+    figure.add_trace(go.Scatter(
+               x = index["columns"]["yearID"][rows],
+               y = running[Stat][rows],
+               mode = "lines+markers",
+               marker = dict(color = 'rgb(250,170,000)'),
+               name = overlay_names[Overlay],
+               yaxis = "y2" if career else "y",
+                               ))
+    if career:
+        figure.update_layout(yaxis2 = {
+        'title' : '<b>Career {}'.format(Stat),
+        'overlaying' : 'y', 'side' : 'right', 'showgrid' : False})
+    return figure
+
 # Callbacks for individual batting stats
 
 # return either the batting, pitching, or fielding graph and update these graphs
 # based on changes
 # to the website's input, reading in the player and stat selected
 
-@app.callback(Output("STATS_GRAPH_BAT", "figure"),
-              [Input("DROPDOWN_PLAYER", "value"),
-               Input("DROPDOWN_STATS", "value")
-               ])
+@player_graph("STATS_GRAPH_BAT", "DROPDOWN_PLAYER", "DROPDOWN_STATS")
 
 def when_triggers_update_graph(
+    data,
     Playerid,
-    Stat
+    Stat,
+    Overlay
 ):
 
-
-# create empty lists so that season stats can be read in based on whether or not
-# a player won an award that year
+# split the player's seasons by whether or not they won an award that year
 # and color code the reulting bar graph (award season bars are displayed
 # slightly off center so that MVP seasons
 # can be displayed alongside other awards won in that season)
-# if statement in place to account for missing years in which a player did not
-# play, appending a 0 for that year
-
-    SSx = []
-    SSy = []
-    MVPx = []
-    MVPy = []
-    Otherx = []
-    Othery = []
-
-    for i in range(int(batting[(batting["playerID"] == Playerid)].yearID.min())
-    , int(batting[(batting["playerID"] == Playerid)].yearID.max()) + 1):
-
-        if i not in batting[batting["playerID"] == Playerid].yearID.unique():
-              Othery.append(0)
-              Otherx.append(i)
-        elif i not in np.array(Awards_Players[(Awards_Players["playerID"] ==
-        Playerid) & ((Awards_Players["awardID"] == "Most Valuable Player")
-              | (Awards_Players["awardID"] == "Silver Slugger"))].yearID):
-              Othery.append(batting.loc[(batting["playerID"] == Playerid) &
-              (batting["yearID"] == i) , Stat].item())
-              Otherx.append(i)
-        if i in np.array(Awards_Players[(Awards_Players["playerID"] == Playerid)
-        & (Awards_Players["awardID"] == "Silver Slugger")].yearID):
-              SSy.append((batting.loc[(batting["playerID"] == Playerid) &
-              (batting["yearID"] == i) , Stat]).item())
-              SSx.append(i)
-        if i in np.array(Awards_Players[(Awards_Players["playerID"] == Playerid)
-        & (Awards_Players["awardID"] == "Most Valuable Player")].yearID):
-              MVPy.append((batting.loc[(batting["playerID"] == Playerid) &
-              (batting["yearID"] == i) , Stat]).item())
-              MVPx.append(i)
+# years in which a player did not play are plotted as 0
 
+    years, values, flags = player_seasons(data, data.batting_index,
+                                          Playerid, Stat)
+    (Otherx, Othery), (SSx, SSy), (MVPx, MVPy) = season_series(
+    years, values, flags, ["Silver Slugger", "Most Valuable Player"])
 
-    return  go.Figure(
+    figure = go.Figure(
              data = [
              go.Bar(
 
@@ -557,8 +2248,8 @@ def when_triggers_update_graph(
                y = Othery,
                marker =dict(color= 'rgb(040,140,210)'),
                name = "Season Stat",
-               width = [.7]*len(Otherx),
-               offset = [-0.35]*len(Otherx),
+               width = .7,
+               offset = -0.35,
                    ),
 
               go.Bar(
@@ -567,8 +2258,8 @@ def when_triggers_update_graph(
                y  = SSy,
                marker =dict(color= 'rgb(150,160,160)'),
                name = "Silver Slugger Season",
-               width = [.7]*len(Otherx),
-               offset = [-0.375]*len(Otherx),
+               width = .7,
+               offset = -0.375,
                     ),
 
                go.Bar(
@@ -577,20 +2268,15 @@ def when_triggers_update_graph(
                y  = MVPy,
                marker =dict(color= 'rgb(220,060,050)'),
                name = "MVP Season",
-               width = [.6]*len(MVPx),
-               offset = [-.125]*len(MVPx),
+               width = .6,
+               offset = -.125,
                     )
 
 
                     ],
 
                layout = go.Layout(
-               title  = '<b>{} <b>{} {HOF} ({})</b><br>{}'.format(
-               people[people["playerID"] == Playerid].nameFirst.item(),people[
-               people["playerID"] == Playerid].nameLast.item(), Stat,
-               all_stars[all_stars["playerID"] == Playerid].playerID.count(),
-               HOF = '*' if any(hallofFame[hallofFame["inducted"] ==
-               "Y"].playerID == Playerid) else ''),
+               title  = player_title(data, Playerid, Stat),
                xaxis={'tickformat': 'd',
                'tickmode' : 'linear',
                'title' : '<b>{}'.format('Year')},
@@ -600,49 +2286,26 @@ def when_triggers_update_graph(
 
                       )
 
+    return player_overlay(data, data.batting_index, figure, Playerid, Stat,
+                          Overlay)
+
 # Callbacks for individual pitching stats
 
-@app.callback(Output("STATS_GRAPH_PITCH", "figure"),
-              [Input("DROPDOWN_PLAYER_PITCH", "value"),
-               Input("DROPDOWN_STATS_PITCH", "value")
-               ])
+@player_graph("STATS_GRAPH_PITCH", "DROPDOWN_PLAYER_PITCH", "DROPDOWN_STATS_PITCH")
 
 def when_triggers_update_graph(
+    data,
     Playerid,
-    Stat
+    Stat,
+    Overlay
 ):
 
-    CYx = []
-    CYy = []
-    MVPx = []
-    MVPy = []
-    Otherx = []
-    Othery = []
-
-    for i in range(int(pitching[(pitching["playerID"] == Playerid)].yearID.min()
-    ) , int(pitching[(pitching["playerID"] == Playerid)].yearID.max()) + 1):
-
-        if i not in pitching[pitching["playerID"] == Playerid].yearID.unique():
-            Othery.append(0)
-            Otherx.append(i)
-        elif i not in np.array(Awards_Players[(Awards_Players["playerID"] ==
-        Playerid) & ((Awards_Players["awardID"] == "Most Valuable Player")
-            | (Awards_Players["awardID"] == "Cy Young Award"))].yearID):
-              Othery.append((pitching.loc[(pitching["playerID"] == Playerid) &
-              (pitching["yearID"] == i) , Stat]).item())
-              Otherx.append(i)
-        if i in np.array(Awards_Players[(Awards_Players["playerID"] == Playerid)
-        & (Awards_Players["awardID"] == "Cy Young Award")].yearID):
-              CYy.append((pitching.loc[(pitching["playerID"] == Playerid) &
-              (pitching["yearID"] == i) , Stat]).item())
-              CYx.append(i)
-        if i in np.array(Awards_Players[(Awards_Players["playerID"] == Playerid)
-        & (Awards_Players["awardID"] == "Most Valuable Player")].yearID):
-              MVPy.append((pitching.loc[(pitching["playerID"] == Playerid) &
-              (pitching["yearID"] == i) , Stat]).item())
-              MVPx.append(i)
+    years, values, flags = player_seasons(data, data.pitching_index,
+                                          Playerid, Stat)
+    (Otherx, Othery), (CYx, CYy), (MVPx, MVPy) = season_series(
+    years, values, flags, ["Cy Young Award", "Most Valuable Player"])
 
-    return  go.Figure(
+    figure = go.Figure(
              data = [
 
              go.Bar(
@@ -651,8 +2314,8 @@ def when_triggers_update_graph(
                y  = Othery,
                marker =dict(color= 'rgb(040,140,210)'),
                name = "Season Stat",
-               width = [.7]*len(Otherx),
-               offset = [-.35]*len(Otherx),
+               width = .7,
+               offset = -.35,
                    ),
 
               go.Bar(
@@ -661,8 +2324,8 @@ def when_triggers_update_graph(
                y  = CYy,
                marker =dict(color= 'rgb(000,170,017)'),
                name = "Cy Young Season",
-               width = [.7]*len(CYx),
-               offset = [-.375]*len(CYx),
+               width = .7,
+               offset = -.375,
                     ),
 
                go.Bar(
@@ -671,20 +2334,15 @@ def when_triggers_update_graph(
                y  = MVPy,
                marker =dict(color= 'rgb(220,060,050)'),
                name = "MVP Season",
-               width = [.6]*len(MVPx),
-               offset = [-.125]*len(MVPx),
+               width = .6,
+               offset = -.125,
                     )
 
 
                     ],
 
                layout = go.Layout(
-               title  = '<b>{} <b>{} {HOF} ({})</b><br>{}'.format(
-               people[people["playerID"] == Playerid].nameFirst.item(),people[
-               people["playerID"] == Playerid].nameLast.item(), Stat,
-               all_stars[all_stars["playerID"] == Playerid].playerID.count(),
-               HOF = '*' if any(hallofFame[hallofFame["inducted"] ==
-               "Y"].playerID == Playerid) else ''),
+               title  = player_title(data, Playerid, Stat),
                xaxis={'tickformat': 'd',
                'tickmode' : 'linear',
                'title' : '<b>{}'.format('Year')},
@@ -694,49 +2352,26 @@ def when_triggers_update_graph(
 
                       )
 
+    return player_overlay(data, data.pitching_index, figure, Playerid, Stat,
+                          Overlay)
+
 # Callbacks for individual fielding stats
 
-@app.callback(Output("STATS_GRAPH_FIELD", "figure"),
-              [Input("DROPDOWN_PLAYER", "value"),
-               Input("DROPDOWN_STATS_FIELD", "value")
-               ])
+@player_graph("STATS_GRAPH_FIELD", "DROPDOWN_PLAYER", "DROPDOWN_STATS_FIELD")
 
 def when_triggers_update_graph(
+    data,
     Playerid,
-    Stat
+    Stat,
+    Overlay
 ):
 
-    GGx = []
-    GGy = []
-    MVPx = []
-    MVPy = []
-    Otherx = []
-    Othery = []
-
-    for i in range(int(fielding[(fielding["playerID"] == Playerid)].yearID.min()
-    ) , int(fielding[(fielding["playerID"] == Playerid)].yearID.max()) + 1):
-
-        if i not in fielding[fielding["playerID"] == Playerid].yearID.unique():
-              Othery.append(0)
-              Otherx.append(i)
-        elif i not in np.array(Awards_Players[(Awards_Players["playerID"] ==
-        Playerid) & ((Awards_Players["awardID"] == "Most Valuable Player")
-              | (Awards_Players["awardID"] == "Gold Glove"))].yearID):
-              Othery.append((fielding.loc[(fielding["playerID"] == Playerid) &
-              (fielding["yearID"] == i) , Stat]).item())
-              Otherx.append(i)
-        if i in np.array(Awards_Players[(Awards_Players["playerID"] == Playerid)
-        & (Awards_Players["awardID"] == "Gold Glove")].yearID):
-              GGy.append((fielding.loc[(fielding["playerID"] == Playerid) &
-              (fielding["yearID"] == i) , Stat]).item())
-              GGx.append(i)
-        if i in np.array(Awards_Players[(Awards_Players["playerID"] == Playerid)
-        & (Awards_Players["awardID"] == "Most Valuable Player")].yearID):
-              MVPy.append((fielding.loc[(fielding["playerID"] == Playerid) &
-              (fielding["yearID"] == i) , Stat]).item())
-              MVPx.append(i)
+    years, values, flags = player_seasons(data, data.fielding_index,
+                                          Playerid, Stat)
+    (Otherx, Othery), (GGx, GGy), (MVPx, MVPy) = season_series(
+    years, values, flags, ["Gold Glove", "Most Valuable Player"])
 
-    return  go.Figure(
+    figure = go.Figure(
                data = [
                go.Bar(
 
@@ -744,8 +2379,8 @@ def when_triggers_update_graph(
                y = Othery,
                marker =dict(color= 'rgb(040,140,210)'),
                name = "Season Stat",
-               width = [.7]*len(Otherx),
-               offset = [-.35]*len(Otherx),
+               width = .7,
+               offset = -.35,
                    ),
 
               go.Bar(
@@ -754,8 +2389,8 @@ def when_triggers_update_graph(
                y  = GGy,
                marker =dict(color= 'rgb(140,140,005)'),
                name = "Gold Glove Season",
-               width = [.7]*len(GGx),
-               offset = [-.375]*len(GGx),
+               width = .7,
+               offset = -.375,
                     ),
 
                go.Bar(
@@ -764,20 +2399,15 @@ def when_triggers_update_graph(
                y  = MVPy,
                marker =dict(color= 'rgb(220,060,050)'),
                name = "MVP Season",
-               width = [.6]*len(MVPx),
-               offset = [-.125]*len(MVPx),
+               width = .6,
+               offset = -.125,
                     )
 
 
                     ],
 
                layout = go.Layout(
-               title  = '<b>{} <b>{} {HOF} ({}) </b><br>{}'.format(
-               people[people["playerID"] == Playerid].nameFirst.item(),people[
-               people["playerID"] == Playerid].nameLast.item(),
-               all_stars[all_stars["playerID"] == Playerid].playerID.count(),
-               Stat, HOF = '*' if any(hallofFame[hallofFame["inducted"] ==
-               "Y"].playerID == Playerid) else ''),
+               title  = player_title(data, Playerid, Stat),
                xaxis={'tickformat': 'd',
                'tickmode' : 'linear',
                'title' : '<b>{}'.format('Year')},
@@ -787,6 +2417,213 @@ def when_triggers_update_graph(
 
                       )
 
+    return player_overlay(data, data.fielding_index, figure, Playerid, Stat,
+                          Overlay)
+
+# Clientside player graphs
+# a bundle holds the player's years and award flags, every stat offered in
+# the stat dropdown as a list over those years (and its running columns
+# under "running"), the graph title without the stat, the overlay line
+# names, and the bar series to draw as [name, color, award bit, width,
+# offset] (bit 0 is the plain season series)
+# the javascript below does what season_series and player_overlay do on
+# the server
+
+def player_bundle(data, index, Playerid, stats_dropdown, series):
+    code = data.player_codes[Playerid]
+    rows = slice(index["starts"][code], index["stops"][code])
+    columns = index["columns"]
+    return {"years" : columns["yearID"][rows],
+            "awards" : columns["awards"][rows],
+            "stats" : {option["value"] : columns[option["value"]][rows]
+                       for option in stats_dropdown.options},
+            "running" : {kind : {option["value"] :
+                                 running[option["value"]][rows]
+                                 for option in stats_dropdown.options
+                                 if option["value"] in running}
+                         for kind, running in index["running"].items()},
+            "overlays" : overlay_names,
+            "title" : player_title(data, Playerid, ""),
+            "series" : [["Season Stat", 'rgb(040,140,210)', 0, .7, -.35]] +
+                       series}
+
+player_figure_js = """
+function(bundle, stat, overlay) {
+    if (!bundle || !stat) {
+        return window.dash_clientside.no_update;
+    }
+    var years = bundle.years, values = bundle.stats[stat];
+    var first = years.length ? years[0] : 0;
+    var span = years.length ? years[years.length - 1] - first + 1 : 0;
+    var full = [], flags = [], played = [], bits = 0;
+    for (var i = 0; i < span; i++) {
+        full.push(0);
+        flags.push(0);
+        played.push(false);
+    }
+    years.forEach(function (year, i) {
+        full[year - first] = values[i];
+        flags[year - first] = bundle.awards[i];
+        played[year - first] = true;
+    });
+    bundle.series.forEach(function (series) {
+        bits |= series[2];
+    });
+    var data = bundle.series.map(function (series) {
+        var x = [], y = [];
+        for (var i = 0; i < span; i++) {
+            if (series[2] ? (flags[i] & series[2]) !== 0 :
+                !played[i] || (flags[i] & bits) === 0) {
+                x.push(first + i);
+                y.push(full[i]);
+            }
+        }
+        return {type: "bar", x: x, y: y, name: series[0],
+                marker: {color: series[1]}, width: series[3],
+                offset: series[4]};
+    });
+    var layout = {
+        title: {text: bundle.title + stat},
+        xaxis: {tickformat: "d", tickmode: "linear",
+                title: {text: "<b>Year"}},
+        yaxis: {title: {text: "<b>" + stat}}};
+    var running = (bundle.running[overlay] || {})[stat];
+    if (running) {
+        data.push({type: "scatter", x: years, y: running,
+                   mode: "lines+markers", marker: {color: "rgb(250,170,000)"},
+                   name: bundle.overlays[overlay],
+                   yaxis: overlay === "career" ? "y2" : "y"});
+        if (overlay === "career") {
+            layout.yaxis2 = {title: {text: "<b>Career " + stat},
+                             overlaying: "y", side: "right",
+                             showgrid: false};
+        }
+    }
+    return {data: data, layout: layout};
+}
+"""
+
+if clientside_stats:
+
+    @app.callback(Output("PLAYER_BUNDLE_BAT", "data"),
+                  [Input("DROPDOWN_PLAYER", "value")])
+    @figure_cache.memoize("PLAYER_BUNDLE_BAT")
+    def batting_bundle(data, Playerid):
+        return player_bundle(data, data.batting_index, Playerid,
+        Batting_Stats_Dropdown,
+        [["Silver Slugger Season", 'rgb(150,160,160)',
+          award_flags["Silver Slugger"], .7, -.375],
+         ["MVP Season", 'rgb(220,060,050)',
+          award_flags["Most Valuable Player"], .6, -.125]])
+
+    @app.callback(Output("PLAYER_BUNDLE_PITCH", "data"),
+                  [Input("DROPDOWN_PLAYER_PITCH", "value")])
+    @figure_cache.memoize("PLAYER_BUNDLE_PITCH")
+    def pitching_bundle(data, Playerid):
+        return player_bundle(data, data.pitching_index, Playerid,
+        Pitching_Stats_Dropdown,
+        [["Cy Young Season", 'rgb(000,170,017)',
+          award_flags["Cy Young Award"], .7, -.375],
+         ["MVP Season", 'rgb(220,060,050)',
+          award_flags["Most Valuable Player"], .6, -.125]])
+
+    @app.callback(Output("PLAYER_BUNDLE_FIELD", "data"),
+                  [Input("DROPDOWN_PLAYER", "value")])
+    @figure_cache.memoize("PLAYER_BUNDLE_FIELD")
+    def fielding_bundle(data, Playerid):
+        return player_bundle(data, data.fielding_index, Playerid,
+        Fielding_Stats_Dropdown,
+        [["Gold Glove Season", 'rgb(140,140,005)',
+          award_flags["Gold Glove"], .7, -.375],
+         ["MVP Season", 'rgb(220,060,050)',
+          award_flags["Most Valuable Player"], .6, -.125]])
+
+    for graph, stats_id in [("BAT", "DROPDOWN_STATS"),
+                            ("PITCH", "DROPDOWN_STATS_PITCH"),
+                            ("FIELD", "DROPDOWN_STATS_FIELD")]:
+        app.clientside_callback(player_figure_js,
+                                Output("STATS_GRAPH_" + graph, "figure"),
+                                [Input("PLAYER_BUNDLE_" + graph, "data"),
+                                 Input(stats_id, "value"),
+                                 Input("RADIO_OVERLAY", "value")])
+
+# Callbacks for player comparisons
+
+# one line per player selected in the comparison dropdown, for the stat
+# picked in the tab's stat dropdown, by calendar year or season of career
+
+def comparison_figure(data, index, Playerids, Stat, Align):
+    career = Align == "career"
+    traces = []
+    for Playerid, years, values in players_seasons(data, index,
+                                                   Playerids or [], Stat):
+        meta = data.player_meta[Playerid]
+        traces.append(go.Scatter(
+               x = years - years[0] + 1 if career and len(years) else years,
+               y = values,
+               mode = "lines+markers",
+               name = "{} {}".format(meta["nameFirst"], meta["nameLast"]),
+                               ))
+    return  go.Figure(
+             data = traces,
+               layout = go.Layout(
+               title  = '<b>{}</b><br>{}'.format('Player Comparison', Stat),
+               xaxis={'tickformat': 'd',
+               'title' : '<b>{}'.format(
+               'Season of Career' if career else 'Year')},
+               yaxis={
+               'title' : '<b>{}'.format(Stat)}
+               )
+
+                      )
+
+@app.callback(Output("COMPARE_GRAPH_BAT", "figure"),
+              [Input("DROPDOWN_COMPARE", "value"),
+               Input("DROPDOWN_STATS", "value"),
+               Input("RADIO_ALIGN", "value")
+               ])
+@figure_cache.memoize("COMPARE_GRAPH_BAT")
+
+def when_triggers_update_graph(
+    data,
+    Playerids,
+    Stat,
+    Align
+):
+    return comparison_figure(data, data.batting_index, Playerids, Stat, Align)
+
+@app.callback(Output("COMPARE_GRAPH_PITCH", "figure"),
+              [Input("DROPDOWN_COMPARE_PITCH", "value"),
+               Input("DROPDOWN_STATS_PITCH", "value"),
+               Input("RADIO_ALIGN", "value")
+               ])
+@figure_cache.memoize("COMPARE_GRAPH_PITCH")
+
+def when_triggers_update_graph(
+    data,
+    Playerids,
+    Stat,
+    Align
+):
+    return comparison_figure(data, data.pitching_index, Playerids, Stat,
+                             Align)
+
+@app.callback(Output("COMPARE_GRAPH_FIELD", "figure"),
+              [Input("DROPDOWN_COMPARE", "value"),
+               Input("DROPDOWN_STATS_FIELD", "value"),
+               Input("RADIO_ALIGN", "value")
+               ])
+@figure_cache.memoize("COMPARE_GRAPH_FIELD")
+
+def when_triggers_update_graph(
+    data,
+    Playerids,
+    Stat,
+    Align
+):
+    return comparison_figure(data, data.fielding_index, Playerids, Stat,
+                             Align)
+
 # Callbacks for team stats
 
 # returning tab contents based on whether team hitting, pitching,
@@ -852,42 +2689,35 @@ def render_content(tab):
                Input("DROPDOWN_STATS_TEAM", "value"),
                Input("DROPDOWN_TEAM_STATS", "value")
                ])
+@figure_cache.memoize("STATS_GRAPH_BAT_TEAM")
 
 def when_triggers_update_graph(
+    data,
     Teamname,
     Stat,
     Stat2
 ):
+             team = data.team_store[Teamname]
+
              return  go.Figure(
              data = [
              go.Bar(
 
-               x  = list(range(teams[teams['teamID'] == Teamname].yearID.min() ,
-               teams[teams['teamID'] == Teamname].yearID.max() + 1)),
-               y  = (teams.loc[((teams["teamID"] == Teamname) & (
-               teams["yearID"] >= teams["yearID"].min()) &
-               (teams["yearID"] <= teams["yearID"].max())) , Stat]),
+               x  = team["years"],
+               y  = team["columns"][Stat],
                name = Stat,
                marker =dict(color= 'rgb(040,140,210)'),
                    ),
              go.Bar(
 
-               x  = list(range(teams[teams['teamID'] == Teamname].yearID.min() ,
-               teams[teams['teamID'] == Teamname].yearID.max() + 1)),
-               y  = (teams.loc[((teams["teamID"] == Teamname) & (
-               teams["yearID"] >= teams["yearID"].min()) &
-               (teams["yearID"] <= teams["yearID"].max())) , Stat2]),
+               x  = team["years"],
+               y  = team["columns"][Stat2],
                name = Stat2,
                marker =dict(color= 'rgb(220,060,050)'),
                    )
                     ],
                layout = go.Layout(
-               title  = '<b>{} {ACT} (<b>{}) </b><br>{} vs {}'.format(
-               Teamname,
-               teams[(teams["teamID"] == Teamname) &
-               (teams["WSWin"] == "Y")].yearID.count(), Stat, Stat2,
-               ACT = '*' if Teamname in franchises.franchName.unique()
-               else ''),
+               title  = team_title(data, Teamname, Stat, Stat2),
                xaxis={'tickformat': 'd',
                'tickmode' : 'linear',
                'title' : '<b>{}'.format('Year')},
@@ -905,43 +2735,36 @@ def when_triggers_update_graph(
                Input("DROPDOWN_STATS_PITCH_TEAM", "value"),
                Input("DROPDOWN_TEAM_STATS", "value")
                ])
+@figure_cache.memoize("STATS_GRAPH_PITCH_TEAM")
 
 def when_triggers_update_graph(
+    data,
     Teamname,
     Stat,
     Stat2
 ):
 
+             team = data.team_store[Teamname]
+
              return  go.Figure(
              data = [
              go.Bar(
 
-               x  = list(range(teams[teams['teamID'] == Teamname].yearID.min() ,
-               teams[teams['teamID'] == Teamname].yearID.max() + 1)),
-               y  = (teams.loc[((teams["teamID"] == Teamname) &
-               (teams["yearID"] >= teams["yearID"].min()) &
-               (teams["yearID"] <= teams["yearID"].max())) , Stat]),
+               x  = team["years"],
+               y  = team["columns"][Stat],
                name = Stat,
                marker =dict(color= 'rgb(040,140,210)'),
                    ),
              go.Bar(
 
-               x  = list(range(teams[teams['teamID'] == Teamname].yearID.min() ,
-               teams[teams['teamID'] == Teamname].yearID.max() + 1)),
-               y  = (teams.loc[((teams["teamID"] == Teamname) &
-               (teams["yearID"] >= teams["yearID"].min()) &
-               (teams["yearID"] <= teams["yearID"].max())) , Stat2]),
+               x  = team["years"],
+               y  = team["columns"][Stat2],
                name = Stat2,
                marker =dict(color= 'rgb(220,060,050)'),
                    )
                      ],
                layout = go.Layout(
-               title  = '<b>{} {ACT} (<b>{}) </b><br>{} vs {}'.format(
-               Teamname,
-               teams[(teams["teamID"] == Teamname) &
-               (teams["WSWin"] == "Y")].yearID.count(), Stat, Stat2,
-               ACT = '*' if Teamname in franchises.franchName.unique()
-               else ''),
+               title  = team_title(data, Teamname, Stat, Stat2),
                xaxis={'tickformat': 'd',
                'tickmode' : 'linear',
                'title' : '<b>{}'.format('Year')},
@@ -958,43 +2781,36 @@ def when_triggers_update_graph(
                Input("DROPDOWN_STATS_FIELD_TEAM", "value"),
                Input("DROPDOWN_TEAM_STATS", "value")
                ])
+@figure_cache.memoize("STATS_GRAPH_FIELD_TEAM")
 
 def when_triggers_update_graph(
+    data,
     Teamname,
     Stat,
     Stat2
 ):
 
+             team = data.team_store[Teamname]
+
              return  go.Figure(
              data = [
              go.Bar(
 
-               x  = list(range(teams[teams['teamID'] == Teamname].yearID.min() ,
-               teams[teams['teamID'] == Teamname].yearID.max() + 1)),
-               y  = (teams.loc[((teams["teamID"] == Teamname) & (
-               teams["yearID"] >= teams["yearID"].min()) &
-               (teams["yearID"] <= teams["yearID"].max())) , Stat]),
+               x  = team["years"],
+               y  = team["columns"][Stat],
                name = Stat,
                marker =dict(color= 'rgb(040,140,210)'),
                    ),
              go.Bar(
 
-               x  = list(range(teams[teams['teamID'] == Teamname].yearID.min() ,
-               teams[teams['teamID'] == Teamname].yearID.max() + 1)),
-               y  = (teams.loc[((teams["teamID"] == Teamname) & (
-               teams["yearID"] >= teams["yearID"].min()) &
-               (teams["yearID"] <= teams["yearID"].max())) , Stat2]),
+               x  = team["years"],
+               y  = team["columns"][Stat2],
                name = Stat2,
                marker =dict(color= 'rgb(220,060,050)'),
                    )
                      ],
                layout = go.Layout(
-               title  = '<b>{} {ACT} (<b>{}) </b><br>{} vs {}'.format(
-               Teamname,
-               teams[(teams["teamID"] == Teamname) &
-               (teams["WSWin"] == "Y")].yearID.count(), Stat, Stat2,
-               ACT = '*' if Teamname in franchises.franchName.unique()
-               else ''),
+               title  = team_title(data, Teamname, Stat, Stat2),
                xaxis={'tickformat': 'd',
                'tickmode' : 'linear',
                'title' : '<b>{}'.format('Year')},
@@ -1069,27 +2885,32 @@ def render_content(tab):
                Input("DROPDOWN_STATS_TEAM", "value"),
                Input("RANGESLIDER_YEAR_LEAGUE", "value")
                ])
+@figure_cache.memoize("STATS_GRAPH_BAT_LEAGUE")
 
 def when_triggers_update_graph(
+    data,
     Lgname,
     Stat,
     Year
 ):
          if Lgname == "Both":
 
+             ALx, ALy = league_series(data, "AL", Stat, Year)
+             NLx, NLy = league_series(data, "NL", Stat, Year)
+
              return  go.Figure(
              data = [
              go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat]["AL"].loc[Year[0] : Year[1]],
+               x  = ALx,
+               y  = ALy,
                marker =dict(color= 'rgb(040,140,210)'),
                name = "American League",
                    ),
              go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat]["NL"].loc[Year[0] : Year[1]],
+               x  = NLx,
+               y  = NLy,
                marker =dict(color= 'rgb(220,060,050)'),
                name = "National League",
                    )
@@ -1108,12 +2929,14 @@ def when_triggers_update_graph(
 
          else:
 
+             Leaguex, Leaguey = league_series(data, Lgname, Stat, Year)
+
              return  go.Figure(
              data = [
              go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat][Lgname].loc[Year[0] : Year[1]],
+               x  = Leaguex,
+               y  = Leaguey,
                    )],
                layout = go.Layout(
                title  = '<b>{} </b><br>{}'.format(Lgname, Stat),
@@ -1133,8 +2956,10 @@ def when_triggers_update_graph(
                Input("DROPDOWN_STATS_PITCH_TEAM", "value"),
                Input("RANGESLIDER_YEAR_LEAGUE", "value")
                ])
+@figure_cache.memoize("STATS_GRAPH_PITCH_LEAGUE")
 
 def when_triggers_update_graph(
+    data,
     Lgname,
     Stat,
     Year
@@ -1142,19 +2967,22 @@ def when_triggers_update_graph(
 
          if Lgname == "Both":
 
+             ALx, ALy = league_series(data, "AL", Stat, Year)
+             NLx, NLy = league_series(data, "NL", Stat, Year)
+
              return  go.Figure(
              data = [
               go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat]["AL"].loc[Year[0] : Year[1]],
+               x  = ALx,
+               y  = ALy,
                marker =dict(color= 'rgb(040,140,210)'),
                name = "American League",
                    ),
              go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat]["NL"].loc[Year[0] : Year[1]],
+               x  = NLx,
+               y  = NLy,
                marker =dict(color= 'rgb(220,060,050)'),
                name = "National League",
                    )
@@ -1174,12 +3002,14 @@ def when_triggers_update_graph(
 
          else:
 
+             Leaguex, Leaguey = league_series(data, Lgname, Stat, Year)
+
              return  go.Figure(
              data = [
              go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat][Lgname].loc[Year[0] : Year[1]],
+               x  = Leaguex,
+               y  = Leaguey,
                    )],
                layout = go.Layout(
                title  = '<b>{} </b><br>{}'.format(Lgname, Stat),
@@ -1200,8 +3030,10 @@ def when_triggers_update_graph(
                Input("DROPDOWN_STATS_FIELD_TEAM", "value"),
                Input("RANGESLIDER_YEAR_LEAGUE", "value")
                ])
+@figure_cache.memoize("STATS_GRAPH_FIELD_LEAGUE")
 
 def when_triggers_update_graph(
+    data,
     Lgname,
     Stat,
     Year
@@ -1209,19 +3041,22 @@ def when_triggers_update_graph(
 
          if Lgname == "Both":
 
+             ALx, ALy = league_series(data, "AL", Stat, Year)
+             NLx, NLy = league_series(data, "NL", Stat, Year)
+
              return  go.Figure(
              data = [
               go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat]["AL"].loc[Year[0] : Year[1]],
+               x  = ALx,
+               y  = ALy,
                marker =dict(color= 'rgb(040,140,210)'),
                name = "American League",
                    ),
              go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat]["NL"].loc[Year[0] : Year[1]],
+               x  = NLx,
+               y  = NLy,
                marker =dict(color= 'rgb(220,060,050)'),
                name = "National League",
                    )
@@ -1241,12 +3076,14 @@ def when_triggers_update_graph(
 
          else:
 
+             Leaguex, Leaguey = league_series(data, Lgname, Stat, Year)
+
              return  go.Figure(
              data = [
              go.Bar(
 
-               x  = list(range(Year[0] , Year[1])),
-               y  = leagues_pivot[Stat][Lgname].loc[Year[0] : Year[1]],
+               x  = Leaguex,
+               y  = Leaguey,
                    )],
                layout = go.Layout(
                title  = '<b>{} </b><br>{}'.format(Lgname, Stat),
@@ -1259,7 +3096,133 @@ def when_triggers_update_graph(
 
                       )
 
-# Running the app
+# Callbacks for leaderboards
+
+# returning tab contents based on whether the batting, pitching or fielding
+# leaders tab is selected, the stat, year (or career) and league dropdowns
+# and the leaderboard table
+
+@app.callback(Output('TABS_DISPLAY_LEADERS', 'children'),
+              [Input('TABS_LEADERS', 'value')])
+def render_content(tab):
+    if tab == 'tab-bat-leaders':
+        return html.Div([
+            html.H3('BATTING LEADERS', style = {"text-align" : "center" ,
+            'color' : 'white', 'font' : 'Cursive'},),
+            html.Div([Batting_Stats_Dropdown_Leaders],id="DROP_DOWN_LEADERS"),
+            html.Div([year_dropdown_leaders],id="DROP_DOWN_YEAR_LEADERS"),
+            html.Div([league_dropdown_leaders],id="DROP_DOWN_LEAGUE_LEADERS"),
+            html.Div([
+                  Leaders_Table_Bat
+                  ], style={'marginTop': 25},
+                     id="TABLE_CONTAINER_BAT_LEADERS"),
+            html.Div([Footnote_Leaders], style = {"text-align" : "center" ,
+            'color' : 'white'}, id="FOOTNOTE_FOUR"),
+        ])
+    elif tab == 'tab-pitch-leaders':
+        return html.Div([
+            html.H3('PITCHING LEADERS', style = {"text-align" : "center" ,
+            'color' : 'white', 'font' : 'Cursive'},),
+            html.Div([Pitching_Stats_Dropdown_Leaders],id="DROP_DOWN_LEADERS"),
+            html.Div([year_dropdown_leaders],id="DROP_DOWN_YEAR_LEADERS"),
+            html.Div([league_dropdown_leaders],id="DROP_DOWN_LEAGUE_LEADERS"),
+            html.Div([
+                  Leaders_Table_Pitch
+                  ], style={'marginTop': 25},
+                     id="TABLE_CONTAINER_PITCH_LEADERS"),
+            html.Div([Footnote_Leaders], style = {"text-align" : "center" ,
+            'color' : 'white'}, id="FOOTNOTE_FOUR"),
+        ])
+    elif tab == 'tab-field-leaders':
+        return html.Div([
+            html.H3('FIELDING LEADERS', style = {"text-align" : "center" ,
+            'color' : 'white', 'font' : 'Cursive'},),
+            html.Div([Fielding_Stats_Dropdown_Leaders],id="DROP_DOWN_LEADERS"),
+            html.Div([year_dropdown_leaders],id="DROP_DOWN_YEAR_LEADERS"),
+            html.Div([league_dropdown_leaders],id="DROP_DOWN_LEAGUE_LEADERS"),
+            html.Div([
+                  Leaders_Table_Field
+                  ], style={'marginTop': 25},
+                     id="TABLE_CONTAINER_FIELD_LEADERS"),
+            html.Div([Footnote_Leaders], style = {"text-align" : "center" ,
+            'color' : 'white'}, id="FOOTNOTE_FOUR"),
+        ])
+
+# rows and columns of a leaderboard table, the team column holds the span
+# of years for careers
+
+def leaders_table(data, name, Stat, Year, Lgname, stats_dropdown):
+    career = Year == "Career"
+    leaders = leaderboard(data, name, Stat, None if career else Year,
+                          "MLB" if career else Lgname)
+    for leader in leaders:
+        leader["team"] = ("{first}-{last}".format(**leader) if career
+                          else leader["teamID"])
+        leader["value"] = leader.pop(Stat)
+    label = {option["value"] : option["label"]
+             for option in stats_dropdown.options}[Stat]
+    return [leaders,
+            [{'name' : "Rank", 'id' : "rank"},
+             {'name' : "Player", 'id' : "name"},
+             {'name' : "Years" if career else "Team", 'id' : "team"},
+             {'name' : label, 'id' : "value"}]]
+
+@app.callback([Output("LEADERS_TABLE_BAT", "data"),
+               Output("LEADERS_TABLE_BAT", "columns")],
+              [Input("DROPDOWN_STATS_BAT_LEADERS", "value"),
+               Input("DROPDOWN_YEAR_LEADERS", "value"),
+               Input("DROPDOWN_LEAGUE_LEADERS", "value")
+               ])
+@figure_cache.memoize("LEADERS_TABLE_BAT")
+
+def when_triggers_update_table(
+    data,
+    Stat,
+    Year,
+    Lgname
+):
+    return leaders_table(data, "batting", Stat, Year, Lgname,
+                         Batting_Stats_Dropdown_Leaders)
+
+@app.callback([Output("LEADERS_TABLE_PITCH", "data"),
+               Output("LEADERS_TABLE_PITCH", "columns")],
+              [Input("DROPDOWN_STATS_PITCH_LEADERS", "value"),
+               Input("DROPDOWN_YEAR_LEADERS", "value"),
+               Input("DROPDOWN_LEAGUE_LEADERS", "value")
+               ])
+@figure_cache.memoize("LEADERS_TABLE_PITCH")
+
+def when_triggers_update_table(
+    data,
+    Stat,
+    Year,
+    Lgname
+):
+    return leaders_table(data, "pitching", Stat, Year, Lgname,
+                         Pitching_Stats_Dropdown_Leaders)
+
+@app.callback([Output("LEADERS_TABLE_FIELD", "data"),
+               Output("LEADERS_TABLE_FIELD", "columns")],
+              [Input("DROPDOWN_STATS_FIELD_LEADERS", "value"),
+               Input("DROPDOWN_YEAR_LEADERS", "value"),
+               Input("DROPDOWN_LEAGUE_LEADERS", "value")
+               ])
+@figure_cache.memoize("LEADERS_TABLE_FIELD")
+
+def when_triggers_update_table(
+    data,
+    Stat,
+    Year,
+    Lgname
+):
+    return leaders_table(data, "fielding", Stat, Year, Lgname,
+                         Fielding_Stats_Dropdown_Leaders)
+
+startup_profile.end()
+startup_profile.report()
+
+# Running the app with the single process development server, see
+# gunicorn.conf.py for running it with several worker processes
 
 if __name__ == '__main__':
     app.run_server(debug=False)
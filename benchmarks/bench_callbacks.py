@@ -0,0 +1,193 @@
+# Callback latency benchmark
+#
+#     python benchmarks/bench_callbacks.py --players 20000 --output run.json
+#     python benchmarks/bench_callbacks.py --data /path/to/core/ --output run.json
+#
+# startup is timed in fresh interpreters, once with an empty cache directory
+# (csv parsing and every derived frame built) and once warm (cache reused)
+# then the app is imported here and every server side callback is called
+# directly through app.callback_map, without a browser or HTTP, with inputs
+# sampled from the app's own dropdowns, tabs and sliders; graph callbacks are
+# timed twice per sample, with the figure cache cleared (miss) and again
+# right after (hit)
+# results are printed and written as JSON so runs can be compared over time
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+module = "baseballStatisticsVisualization"
+
+startup_code = ("import time; start = time.perf_counter(); import {}; "
+                "print(time.perf_counter() - start)").format(module)
+
+def startup_seconds(env):
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c",
+                             startup_code], cwd = root, env = env,
+                            capture_output = True, text = True, check = True)
+    return float(result.stdout.split()[-1])
+
+def percentiles(samples):
+    if not samples:
+        return None
+    samples = np.array(samples) * 1000
+    return {"calls" : len(samples),
+            "mean_ms" : round(float(samples.mean()), 3),
+            "p50_ms" : round(float(np.percentile(samples, 50)), 3),
+            "p95_ms" : round(float(np.percentile(samples, 95)), 3),
+            "p99_ms" : round(float(np.percentile(samples, 99)), 3),
+            "max_ms" : round(float(samples.max()), 3)}
+
+# the values a callback input can take, read off the app's components
+# (players come from the search options, since the dropdowns only carry the
+# current selection; the comparison dropdowns take a list of 1 to
+# compare_limit of them)
+
+def input_choices(app, dependency):
+    component_id, prop = dependency["id"], dependency["property"]
+    data = app.data_manager.snapshot
+    searches = {"DROPDOWN_PLAYER" : data.batting_search,
+                "DROPDOWN_PLAYER_PITCH" : data.pitching_search,
+                "DROPDOWN_COMPARE" : data.batting_search,
+                "DROPDOWN_COMPARE_PITCH" : data.pitching_search}
+    if component_id in searches:
+        search = searches[component_id]
+        if prop == "search_value":
+            return sorted({name[:3] for name in search["names"]})
+        if component_id.startswith("DROPDOWN_COMPARE"):
+            return ("players", sorted(search["options"]), app.compare_limit)
+        return sorted(search["options"])
+    components = {getattr(value, "id", None) : value
+                  for value in vars(app).values()
+                  if hasattr(value, "_prop_names")}
+    component = components[component_id]
+    if hasattr(component, "options"):
+        return [option["value"] for option in component.options]
+    if hasattr(component, "children") and isinstance(component.children,
+                                                     list):
+        return [tab.value for tab in component.children]
+    if hasattr(component, "min") and hasattr(component, "max"):
+        return ("range", int(component.min), int(component.max))
+    raise KeyError(component_id)
+
+def sample_args(rng, choices):
+    args = []
+    for choice in choices:
+        if isinstance(choice, tuple) and choice[0] == "players":
+            _, players, limit = choice
+            picked = rng.choice(len(players), rng.integers(1, limit + 1),
+                                replace = False)
+            args.append([players[i] for i in picked])
+        elif isinstance(choice, tuple):
+            _, low, high = choice
+            first, last = sorted(rng.integers(low, high + 1, 2).tolist())
+            args.append([first, last])
+        else:
+            args.append(choice[rng.integers(len(choice))])
+    return args
+
+def run_callbacks(app, samples, seed):
+    from dash.exceptions import PreventUpdate
+    rng = np.random.default_rng(seed)
+    results = {}
+    for key, entry in sorted(app.app.callback_map.items()):
+        if "callback" not in entry:
+            continue
+        func = entry["callback"].__wrapped__
+        memoized = hasattr(func, "__wrapped__")
+        choices = [input_choices(app, dependency) for dependency in
+                   entry["inputs"] + entry.get("state", [])]
+        miss, hit, skipped, errors = [], [], 0, 0
+        for _ in range(samples):
+            args = sample_args(rng, choices)
+            if memoized:
+                app.figure_cache.clear()
+            try:
+                start = time.perf_counter()
+                func(*args)
+                miss.append(time.perf_counter() - start)
+                if memoized:
+                    start = time.perf_counter()
+                    func(*args)
+                    hit.append(time.perf_counter() - start)
+            except PreventUpdate:
+                skipped += 1
+            except Exception:
+                errors += 1
+        results[key] = {"function" : getattr(func, "__name__", ""),
+                        "miss" : percentiles(miss), "hit" : percentiles(hit),
+                        "prevented" : skipped, "errors" : errors}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description = "callback benchmarks")
+    parser.add_argument("--data", help = "Lahman core csv directory "
+                        "(default: generate a synthetic one)")
+    parser.add_argument("--players", type = int, default = 5000,
+                        help = "players in the synthetic dataset")
+    parser.add_argument("--samples", type = int, default = 200,
+                        help = "calls per callback")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--output", help = "write the results as JSON here")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix = "lahman-bench-")
+    data = args.data
+    if data is None:
+        sys.path.insert(0, here)
+        import synthetic_lahman
+        data = os.path.join(scratch, "core")
+        synthetic_lahman.main(data, args.players, 1871, 2018, args.seed)
+    data = os.path.join(data, "")
+
+    env = dict(os.environ, LAHMAN_DATA_PATH = data,
+               LAHMAN_CACHE_PATH = os.path.join(scratch, "cache"))
+    cold = startup_seconds(env)
+    warm = startup_seconds(env)
+    os.environ.update(env)
+
+    warnings.simplefilter("ignore")
+    sys.path.insert(0, root)
+    start = time.perf_counter()
+    app = __import__(module)
+    in_process = time.perf_counter() - start
+    callbacks = run_callbacks(app, args.samples, args.seed)
+
+    report = {"date" : datetime.datetime.now().isoformat(timespec="seconds"),
+              "python" : platform.python_version(),
+              "machine" : platform.machine(),
+              "dataset" : {"path" : data if args.data else None,
+                           "players" : len(app.data_manager.snapshot.people),
+                           "samples" : args.samples, "seed" : args.seed},
+              "startup" : {"cold_s" : round(cold, 3),
+                           "warm_s" : round(warm, 3),
+                           "in_process_s" : round(in_process, 3)},
+              "callbacks" : callbacks}
+
+    print("startup: cold {:.2f}s, warm {:.2f}s".format(cold, warm))
+    print("{:<38}{:>10}{:>10}{:>10}{:>10}".format(
+    "callback (ms)", "p50", "p95", "p99", "hit p50"))
+    for key, result in callbacks.items():
+        miss, hit = result["miss"] or {}, result["hit"] or {}
+        print("{:<38}{:>10}{:>10}{:>10}{:>10}".format(
+        key, miss.get("p50_ms", "-"), miss.get("p95_ms", "-"),
+        miss.get("p99_ms", "-"), hit.get("p50_ms", "-")))
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(report, out, indent = 2)
+    shutil.rmtree(scratch, ignore_errors = True)
+
+if __name__ == "__main__":
+    main()
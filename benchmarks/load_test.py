@@ -0,0 +1,413 @@
+# Concurrent load test against the Dash update endpoint
+#
+#     python benchmarks/load_test.py --profile mixed --concurrency 1,2,4,8,16
+#     python benchmarks/load_test.py --url http://127.0.0.1:8050 --profile team
+#     python benchmarks/load_test.py --workers 4 --output load.json
+#
+# without --url the app is started locally (the Dash dev server, or gunicorn
+# with gunicorn.conf.py when --workers is given) on a synthetic dataset
+# unless --data points at real csv files, so the whole run works offline
+# every simulated user replays the /_dash-update-component POSTs a browser
+# would send for a traffic profile: picking and searching players, switching
+# stats, adding players to a comparison, picking teams, dragging the league
+# year slider, paging through leaderboards; each concurrency level runs for
+# --duration seconds with that many users sending back to back, and
+# reports throughput, latency percentiles and the error rate
+# everything the users pick from (players, stats, teams, slider bounds) is
+# discovered from the running app over HTTP
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+module = "baseballStatisticsVisualization"
+
+# Traffic profiles
+# "on_screen" are the callback outputs shown on the profile's tab (a change
+# fires only those, as in the browser), "actions" are (weight, kind, prop)
+# with kind "pick" (choose a new value), "type" (type a search three
+# letters at a time), "add" (add a player to a multi select, dropping the
+# earliest one past compare_limit, the app's own cap) or "drag" (move one
+# end of the range slider a few steps, one request per step)
+# the leaderboard tables are multi output callbacks, named the way Dash
+# names them ("..LEADERS_TABLE_BAT.data...LEADERS_TABLE_BAT.columns..")
+
+compare_limit = 10
+
+def table_output(table):
+    return "..{0}.data...{0}.columns..".format(table)
+
+profiles = {
+"batting" : {
+    "on_screen" : ["STATS_GRAPH_BAT.figure", "DROPDOWN_PLAYER.options",
+                   "COMPARE_GRAPH_BAT.figure", "DROPDOWN_COMPARE.options"],
+    "actions" : [(3, "pick", "DROPDOWN_PLAYER.value"),
+                 (1, "type", "DROPDOWN_PLAYER.search_value"),
+                 (6, "pick", "DROPDOWN_STATS.value"),
+                 (1, "pick", "RADIO_OVERLAY.value"),
+                 (2, "add", "DROPDOWN_COMPARE.value"),
+                 (1, "type", "DROPDOWN_COMPARE.search_value"),
+                 (1, "pick", "RADIO_ALIGN.value")]},
+"pitching" : {
+    "on_screen" : ["STATS_GRAPH_PITCH.figure",
+                   "DROPDOWN_PLAYER_PITCH.options",
+                   "COMPARE_GRAPH_PITCH.figure",
+                   "DROPDOWN_COMPARE_PITCH.options"],
+    "actions" : [(3, "pick", "DROPDOWN_PLAYER_PITCH.value"),
+                 (1, "type", "DROPDOWN_PLAYER_PITCH.search_value"),
+                 (6, "pick", "DROPDOWN_STATS_PITCH.value"),
+                 (1, "pick", "RADIO_OVERLAY.value"),
+                 (2, "add", "DROPDOWN_COMPARE_PITCH.value"),
+                 (1, "type", "DROPDOWN_COMPARE_PITCH.search_value"),
+                 (1, "pick", "RADIO_ALIGN.value")]},
+"fielding" : {
+    "on_screen" : ["STATS_GRAPH_FIELD.figure", "DROPDOWN_PLAYER.options",
+                   "COMPARE_GRAPH_FIELD.figure", "DROPDOWN_COMPARE.options"],
+    "actions" : [(3, "pick", "DROPDOWN_PLAYER.value"),
+                 (1, "type", "DROPDOWN_PLAYER.search_value"),
+                 (6, "pick", "DROPDOWN_STATS_FIELD.value"),
+                 (2, "add", "DROPDOWN_COMPARE.value"),
+                 (1, "type", "DROPDOWN_COMPARE.search_value"),
+                 (1, "pick", "RADIO_ALIGN.value")]},
+"team" : {
+    "on_screen" : ["STATS_GRAPH_BAT_TEAM.figure"],
+    "actions" : [(4, "pick", "DROPDOWN_TEAM.value"),
+                 (4, "pick", "DROPDOWN_STATS_TEAM.value"),
+                 (2, "pick", "DROPDOWN_TEAM_STATS.value")]},
+"league" : {
+    "on_screen" : ["STATS_GRAPH_BAT_LEAGUE.figure"],
+    "actions" : [(2, "pick", "DROPDOWN_LEAGUE.value"),
+                 (3, "pick", "DROPDOWN_STATS_TEAM.value"),
+                 (5, "drag", "RANGESLIDER_YEAR_LEAGUE.value")]},
+"leaders" : {
+    "on_screen" : [table_output("LEADERS_TABLE_BAT")],
+    "actions" : [(4, "pick", "DROPDOWN_STATS_BAT_LEADERS.value"),
+                 (4, "pick", "DROPDOWN_YEAR_LEADERS.value"),
+                 (2, "pick", "DROPDOWN_LEAGUE_LEADERS.value")]}}
+
+profiles["player"] = {
+"on_screen" : sorted(set(profiles["batting"]["on_screen"] +
+                         profiles["pitching"]["on_screen"] +
+                         profiles["fielding"]["on_screen"])),
+"actions" : (profiles["batting"]["actions"] +
+             profiles["pitching"]["actions"] +
+             [action for action in profiles["fielding"]["actions"]
+              if action[2] == "DROPDOWN_STATS_FIELD.value"])}
+profiles["mixed"] = {
+"on_screen" : sorted(set(profiles["player"]["on_screen"] +
+                         profiles["team"]["on_screen"] +
+                         profiles["league"]["on_screen"] +
+                         profiles["leaders"]["on_screen"])),
+"actions" : (profiles["player"]["actions"] + profiles["team"]["actions"] +
+             profiles["league"]["actions"] + profiles["leaders"]["actions"])}
+
+def request(url, path, body = None, timeout = 60):
+    data = None if body is None else json.dumps(body).encode()
+    req = urllib.request.Request(url + path, data = data, headers = {
+          "Content-Type" : "application/json"})
+    with urllib.request.urlopen(req, timeout = timeout) as response:
+        return response.status, response.read()
+
+def output_items(output):
+    if output.startswith(".."):
+        return [dict(zip(["id", "property"], item.split(".")))
+                for item in output[2:-2].split("...")]
+    return dict(zip(["id", "property"], output.split(".")))
+
+def callback_body(dependency, values, changed):
+    return {"output" : dependency["output"],
+            "outputs" : output_items(dependency["output"]),
+            "inputs" : [dict(item, value = values.get(
+                        item["id"] + "." + item["property"]))
+                        for item in dependency["inputs"]],
+            "state" : [dict(item, value = values.get(
+                       item["id"] + "." + item["property"]))
+                       for item in dependency.get("state", [])],
+            "changedPropIds" : [changed]}
+
+def update(url, dependency, values, changed):
+    status, payload = request(url, "/_dash-update-component",
+                              callback_body(dependency, values, changed))
+    return json.loads(payload) if status == 200 else None
+
+# Discovering the values each input can take
+# the layout and every tab's content (rendered by asking the app for each
+# tab in turn) give the dropdown options and slider bounds, players come
+# from searching every letter of the alphabet
+
+def components(tree, found):
+    if isinstance(tree, dict):
+        props = tree.get("props")
+        if isinstance(props, dict) and "id" in props:
+            found[props["id"]] = props
+        for value in tree.values():
+            components(value, found)
+    elif isinstance(tree, list):
+        for item in tree:
+            components(item, found)
+    return found
+
+def discover(url):
+    dependencies = json.loads(request(url, "/_dash-dependencies")[1])
+    found = components(json.loads(request(url, "/_dash-layout")[1]), {})
+    rendered = set()
+    while True:
+        tabs = [(component_id, props) for component_id, props in found.items()
+                if component_id not in rendered and
+                isinstance(props.get("children"), list) and
+                all(isinstance(tab, dict) and tab.get("type") == "Tab"
+                    for tab in props["children"])]
+        if not tabs:
+            break
+        for component_id, props in tabs:
+            rendered.add(component_id)
+            prop = component_id + ".value"
+            for dependency in dependencies:
+                if [item["id"] + "." + item["property"]
+                    for item in dependency["inputs"]] != [prop]:
+                    continue
+                for tab in props["children"]:
+                    components(update(url, dependency,
+                                      {prop : tab["props"]["value"]}, prop),
+                               found)
+    choices, values = {}, {}
+    for component_id, props in found.items():
+        if "options" in props:
+            choices[component_id + ".value"] = [
+            option["value"] for option in props["options"]]
+        if "min" in props and "max" in props:
+            choices[component_id + ".value"] = ("range", int(props["min"]),
+                                                int(props["max"]))
+        if "value" in props:
+            values[component_id + ".value"] = props["value"]
+    for dependency in dependencies:
+        # (multi output callbacks, "..A.data...A.columns..", update tables)
+        if dependency["output"].startswith(".."):
+            continue
+        player, prop = dependency["output"].split(".")
+        if prop != "options":
+            continue
+        names, ids = set(), set(choices.get(player + ".value", []))
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            response = update(url, dependency,
+                              {player + ".search_value" : letter},
+                              player + ".search_value")
+            for option in (response or {}).get("response", {}).get(
+                           player, {}).get("options", []):
+                ids.add(option["value"])
+                names.add(option["label"].split("(")[0].lower())
+        choices[player + ".value"] = sorted(ids)
+        choices[player + ".search_value"] = sorted(names)
+    return dependencies, choices, values
+
+# A simulated user
+# holds the values of every input like the browser does, and turns each
+# action into the callback requests it would fire
+
+class User:
+
+    def __init__(self, profile, dependencies, choices, values, seed):
+        self.rng = np.random.default_rng(seed)
+        self.choices = choices
+        self.values = dict(values)
+        self.actions = [action for action in profile["actions"]
+                        if action[2] in choices]
+        weights = np.array([action[0] for action in self.actions], float)
+        self.weights = weights / weights.sum()
+        self.fires = {}
+        for dependency in dependencies:
+            if dependency["output"] not in profile["on_screen"]:
+                continue
+            for item in dependency["inputs"]:
+                self.fires.setdefault(item["id"] + "." + item["property"],
+                                      []).append(dependency)
+
+    def changes(self):
+        _, kind, prop = self.actions[self.rng.choice(len(self.actions),
+                                                     p = self.weights)]
+        choices = self.choices[prop]
+        if kind == "pick":
+            yield prop, choices[self.rng.integers(len(choices))]
+        elif kind == "add":
+            picked = list(self.values.get(prop) or [])
+            picked.append(choices[self.rng.integers(len(choices))])
+            yield prop, picked[-compare_limit:]
+        elif kind == "type":
+            name = choices[self.rng.integers(len(choices))]
+            for end in range(3, len(name) + 3, 3):
+                yield prop, name[:end]
+        elif kind == "drag":
+            _, low, high = choices
+            first, last = self.values.get(prop) or [low, high]
+            end = self.rng.integers(2)
+            for _ in range(5):
+                step = int(self.rng.integers(-5, 6))
+                if end == 0:
+                    first = min(max(low, first + step), last)
+                else:
+                    last = max(min(high, last + step), first)
+                yield prop, [first, last]
+
+    def requests(self):
+        for prop, value in self.changes():
+            self.values[prop] = value
+            for dependency in self.fires.get(prop, []):
+                yield dependency["output"], callback_body(dependency,
+                                                          self.values, prop)
+
+# Running one concurrency level: every user thread sends its requests back
+# to back until the time is up
+
+def run_level(url, profile, dependencies, choices, values, concurrency,
+              duration, seed):
+    latencies, errors, lock = [], [], threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def user_loop(number):
+        user = User(profile, dependencies, choices, values,
+                    seed * 1000 + number)
+        while time.perf_counter() < stop:
+            for output, body in user.requests():
+                start = time.perf_counter()
+                try:
+                    status, _ = request(url, "/_dash-update-component", body)
+                    ok = status in (200, 204)
+                except (urllib.error.URLError, OSError):
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with lock:
+                    (latencies if ok else errors).append(elapsed)
+
+    threads = [threading.Thread(target = user_loop, args = (number,))
+               for number in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    total = len(latencies) + len(errors)
+    samples = np.array(latencies or [np.nan]) * 1000
+    return {"concurrency" : concurrency, "requests" : total,
+            "seconds" : round(elapsed, 3),
+            "throughput_rps" : round(len(latencies) / elapsed, 2),
+            "p50_ms" : round(float(np.percentile(samples, 50)), 2),
+            "p95_ms" : round(float(np.percentile(samples, 95)), 2),
+            "p99_ms" : round(float(np.percentile(samples, 99)), 2),
+            "error_rate" : round(len(errors) / total, 4) if total else 0.0}
+
+# Starting the app locally
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_app(data, cache, workers):
+    port = free_port()
+    env = dict(os.environ, LAHMAN_DATA_PATH = data,
+               LAHMAN_CACHE_PATH = cache)
+    if workers:
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+                   "--bind", "127.0.0.1:{}".format(port),
+                   "--workers", str(workers), module + ":server"]
+    else:
+        command = [sys.executable, "-W", "ignore", "-c",
+                   "import {} as app; app.app.run_server(host='127.0.0.1', "
+                   "port={}, debug=False, threaded=True)".format(module, port)]
+    process = subprocess.Popen(command, cwd = root, env = env,
+                               stdout = subprocess.DEVNULL,
+                               stderr = subprocess.DEVNULL)
+    url = "http://127.0.0.1:{}".format(port)
+    deadline = time.time() + 300
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("the app exited while starting")
+        try:
+            request(url, "/", timeout = 2)
+            return process, url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("the app did not start within 300 seconds")
+
+def main():
+    parser = argparse.ArgumentParser(description = "Dash load test")
+    parser.add_argument("--url", help = "load an already running app "
+                        "instead of starting one")
+    parser.add_argument("--data", help = "Lahman core csv directory "
+                        "(default: generate a synthetic one)")
+    parser.add_argument("--players", type = int, default = 5000,
+                        help = "players in the synthetic dataset")
+    parser.add_argument("--workers", type = int, default = 0,
+                        help = "serve with this many gunicorn workers "
+                        "(default: the Dash dev server)")
+    parser.add_argument("--profile", choices = sorted(profiles),
+                        default = "mixed")
+    parser.add_argument("--concurrency", default = "1,2,4,8,16",
+                        help = "comma separated numbers of users")
+    parser.add_argument("--duration", type = float, default = 10,
+                        help = "seconds per concurrency level")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--output", help = "write the results as JSON here")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix = "lahman-load-")
+    process, url = None, args.url
+    try:
+        if url is None:
+            data = args.data
+            if data is None:
+                sys.path.insert(0, here)
+                import synthetic_lahman
+                data = os.path.join(scratch, "core")
+                synthetic_lahman.main(data, args.players, 1871, 2018,
+                                      args.seed)
+            process, url = start_app(os.path.join(data, ""),
+                                     os.path.join(scratch, "cache"),
+                                     args.workers)
+        url = url.rstrip("/")
+        dependencies, choices, values = discover(url)
+        levels = []
+        print("{:>6}{:>10}{:>10}{:>10}{:>10}{:>10}{:>8}".format(
+        "users", "requests", "rps", "p50 ms", "p95 ms", "p99 ms", "errors"))
+        for concurrency in [int(level) for level in
+                            args.concurrency.split(",")]:
+            level = run_level(url, profiles[args.profile], dependencies,
+                              choices, values, concurrency, args.duration,
+                              args.seed)
+            levels.append(level)
+            print("{:>6}{:>10}{:>10}{:>10}{:>10}{:>10}{:>8.2%}".format(
+            concurrency, level["requests"], level["throughput_rps"],
+            level["p50_ms"], level["p95_ms"], level["p99_ms"],
+            level["error_rate"]))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(scratch, ignore_errors = True)
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump({"date" : datetime.datetime.now().isoformat(
+                       timespec = "seconds"),
+                       "url" : args.url, "workers" : args.workers,
+                       "profile" : args.profile,
+                       "duration_s" : args.duration, "levels" : levels},
+                      out, indent = 2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# Writes synthetic Lahman core csv files (People, Batting, Pitching,
+# Fielding, Teams, TeamsFranchises, HallOfFame, AllstarFull and
+# AwardsPlayers) with the real column layout (every column of the 2019
+# databank, in its order), for running and benchmarking the app without the
+# databank
+#
+#     python benchmarks/synthetic_lahman.py /tmp/lahman --players 20000
+#     LAHMAN_DATA_PATH=/tmp/lahman/ python baseballStatisticsVisualization.py
+#
+# the data is random but shaped like the real thing: careers of 1 to 21
+# seasons, traded players with a second stint, a second fielding position
+# for some players, nulls in the early seasons, the 19th century leagues,
+# a team with gaps in its history, and the app's default selections
+# (mauerjo01, clemero02 and MIN) present
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+teams_per_league = {"AL": 15, "NL": 15}
+old_leagues = {"AA": (1882, 1891), "UA": (1884, 1884), "PL": (1890, 1890),
+               "FL": (1914, 1915), "NA": (1871, 1875)}
+awards = ["Most Valuable Player", "Silver Slugger", "Gold Glove",
+          "Cy Young Award", "Rookie of the Year"]
+
+# the 2019 databank's columns, for the tables whose extra columns the app
+# does not read
+people_columns = ["playerID", "birthYear", "birthMonth", "birthDay",
+                  "birthCountry", "birthState", "birthCity", "deathYear",
+                  "deathMonth", "deathDay", "deathCountry", "deathState",
+                  "deathCity", "nameFirst", "nameLast", "nameGiven",
+                  "weight", "height", "bats", "throws", "debut",
+                  "finalGame", "retroID", "bbrefID"]
+teams_columns = ["yearID", "lgID", "teamID", "franchID", "divID", "Rank",
+                 "G", "Ghome", "W", "L", "DivWin", "WCWin", "LgWin",
+                 "WSWin", "R", "AB", "H", "2B", "3B", "HR", "BB", "SO", "SB",
+                 "CS", "HBP", "SF", "RA", "ER", "ERA", "CG", "SHO", "SV",
+                 "IPouts", "HA", "HRA", "BBA", "SOA", "E", "DP", "FP",
+                 "name", "park", "attendance", "BPF", "PPF", "teamIDBR",
+                 "teamIDlahman45", "teamIDretro"]
+pitching_columns = ["playerID", "yearID", "stint", "teamID", "lgID", "W",
+                    "L", "G", "GS", "CG", "SHO", "SV", "IPouts", "H", "ER",
+                    "HR", "BB", "SO", "BAOpp", "ERA", "IBB", "WP", "HBP",
+                    "BK", "BFP", "GF", "R", "SH", "SF", "GIDP"]
+
+
+def write(frame, out, name):
+    frame.to_csv(os.path.join(out, name + ".csv"), index=False)
+
+
+def main(out, players, first_year, last_year, seed):
+    rng = np.random.default_rng(seed)
+    # (the columns the app does not read are drawn from their own stream,
+    # so the ones it does read stay the same as before they were added)
+    extra = np.random.default_rng(seed + 1000)
+    os.makedirs(out, exist_ok=True)
+
+    ids = np.array(["p{:06d}".format(i) for i in range(players)],
+                   dtype=object)
+    # keep the app's default dropdown selections resolvable
+    ids[:2] = ["mauerjo01", "clemero02"]
+    first_names = np.array(["Joe", "Babe", "Ty", "Cy", "Hank", "Willie",
+                            "Mickey", "Ted", "Lou", "Roberto"])
+    last_names = np.array(["Mauer", "Ruth", "Cobb", "Young", "Aaron", "Mays",
+                           "Mantle", "Williams", "Gehrig", "Clemente"])
+    debut = rng.integers(first_year, last_year + 1, players)
+    length = rng.integers(1, 22, players)
+    debut[:2] = [max(first_year, last_year - 14), max(first_year, last_year - 34)]
+    length[:2] = [15, 24]
+    final = np.minimum(debut + length - 1, last_year)
+    people = pd.DataFrame({
+        "playerID": ids,
+        "nameFirst": first_names[rng.integers(0, 10, players)],
+        "nameLast": np.char.add(last_names[rng.integers(0, 10, players)],
+                                (np.arange(players) % 97).astype(str)),
+        "weight": rng.integers(150, 260, players),
+        "height": rng.integers(64, 80, players),
+        "bats": rng.choice(["R", "L", "B"], players),
+        "throws": rng.choice(["R", "L"], players),
+        "debut": pd.Series(debut).astype(str) + "-04-15",
+        "finalGame": pd.Series(final).astype(str) + "-09-30",
+    })
+    birth = debut - extra.integers(19, 27, players)
+    people["birthYear"] = birth
+    people["birthMonth"] = extra.integers(1, 13, players)
+    people["birthDay"] = extra.integers(1, 29, players)
+    people["birthCountry"] = extra.choice(["USA", "D.R.", "Venezuela",
+                                           "CAN"], players)
+    people["birthState"] = np.where(people["birthCountry"] == "USA",
+                                    extra.choice(["CA", "TX", "NY"],
+                                                 players), "")
+    people["birthCity"] = extra.choice(["Springfield", "Franklin"], players)
+    # players whose careers ended long ago have died
+    dead = (final < 1990) & (extra.random(players) < 0.8)
+    death = np.where(dead, np.minimum(birth + extra.integers(50, 95,
+                                                            players), 2018),
+                     np.nan)
+    people["deathYear"] = death
+    people["deathMonth"] = np.where(dead, extra.integers(1, 13, players),
+                                    np.nan)
+    people["deathDay"] = np.where(dead, extra.integers(1, 29, players),
+                                  np.nan)
+    people["deathCountry"] = np.where(dead, people["birthCountry"], "")
+    people["deathState"] = np.where(dead, people["birthState"], "")
+    people["deathCity"] = np.where(dead, people["birthCity"], "")
+    people["nameGiven"] = people["nameFirst"] + " " + people["nameLast"]
+    people["retroID"] = people["playerID"]
+    people["bbrefID"] = people["playerID"]
+    write(people[people_columns], out, "People")
+
+    team_rows = []
+    for year in range(first_year, last_year + 1):
+        for lg, count in teams_per_league.items():
+            for t in range(count):
+                team_id = "MIN" if (lg, t) == ("AL", 5) else \
+                    "{}{:02d}".format(lg[0], t)
+                team_rows.append((year, lg, team_id,
+                                  "F{}{:02d}".format(lg[0], t)))
+        for lg, (start, stop) in old_leagues.items():
+            if start <= year <= stop:
+                for t in range(8):
+                    team_rows.append((year, lg, "{}{}".format(lg, t),
+                                      "X{}{}".format(lg, t)))
+    teams = pd.DataFrame(team_rows, columns=["yearID", "lgID", "teamID",
+                                             "franchID"])
+    n = len(teams)
+    # skip a season now and then so franchise histories have gaps
+    teams = teams[(teams["yearID"] % 17 != 3) | (teams["teamID"] != "A01")]
+    n = len(teams)
+    for col in ["G", "Ghome", "W", "L", "R", "AB", "H", "2B", "3B", "HR",
+                "BB", "SO", "SB", "CS", "HBP", "SF", "RA", "ER", "CG", "SHO",
+                "SV", "IPouts", "HA", "HRA", "BBA", "SOA", "E", "DP"]:
+        teams[col] = rng.integers(0, 1500, n)
+    teams["ERA"] = np.round(rng.uniform(2, 6, n), 2)
+    teams["FP"] = np.round(rng.uniform(0.95, 0.99, n), 3)
+    teams["WSWin"] = np.where(rng.random(n) < 0.05, "Y", "N")
+    teams["name"] = "Team " + teams["teamID"]
+    teams["attendance"] = rng.integers(100000, 4000000, n)
+    teams["BPF"] = rng.integers(90, 110, n)
+    teams["PPF"] = rng.integers(90, 110, n)
+    # divisions from 1969, wild cards from 1995, and empty fields before
+    # (as in the databank)
+    divisions = teams["yearID"] >= 1969
+    teams["divID"] = np.where(divisions, extra.choice(["E", "C", "W"], n),
+                              "")
+    teams["Rank"] = extra.integers(1, 9, n)
+    teams["DivWin"] = np.where(divisions, np.where(teams["Rank"] == 1, "Y",
+                                                   "N"), "")
+    teams["WCWin"] = np.where(teams["yearID"] >= 1995,
+                              np.where(extra.random(n) < 0.1, "Y", "N"), "")
+    teams["LgWin"] = np.where(extra.random(n) < 0.07, "Y", "N")
+    teams["park"] = "Park " + teams["teamID"]
+    teams["teamIDBR"] = teams["teamID"]
+    teams["teamIDlahman45"] = teams["teamID"]
+    teams["teamIDretro"] = teams["teamID"]
+    write(teams[teams_columns], out, "Teams")
+
+    franch = teams.drop_duplicates("franchID")[["franchID"]].copy()
+    franch["franchName"] = "Franchise " + franch["franchID"]
+    franch["active"] = np.where(franch["franchID"].str.startswith("F"),
+                                "Y", "N")
+    franch["NAassoc"] = ""
+    write(franch, out, "TeamsFranchises")
+
+    seasons = []
+    for pid, start, stop in zip(ids, debut, final):
+        for year in range(start, stop + 1):
+            if rng.random() < 0.08:
+                continue
+            seasons.append((pid, year))
+    seasons = pd.DataFrame(seasons, columns=["playerID", "yearID"])
+    # traded players get a second stint
+    traded = seasons.sample(frac=0.1, random_state=seed)
+    seasons["stint"] = 1
+    traded = traded.assign(stint=2)
+    stints = pd.concat([seasons, traded]).sort_values(
+        ["playerID", "yearID", "stint"]).reset_index(drop=True)
+    year_teams = teams.groupby("yearID")
+    pick = rng.integers(0, 1 << 30, len(stints))
+    team_index = []
+    team_years = {y: g[["teamID", "lgID"]].to_numpy()
+                  for y, g in year_teams}
+    for year, p in zip(stints["yearID"], pick):
+        options = team_years[year]
+        team_index.append(options[p % len(options)])
+    team_index = np.array(team_index)
+    stints["teamID"] = team_index[:, 0]
+    stints["lgID"] = team_index[:, 1]
+    m = len(stints)
+
+    batting = stints.copy()
+    for col, high in [("G", 162), ("AB", 650), ("R", 130), ("H", 220),
+                      ("2B", 50), ("3B", 15), ("HR", 60), ("RBI", 150),
+                      ("SB", 80), ("CS", 25), ("BB", 120), ("SO", 200),
+                      ("IBB", 30), ("HBP", 20), ("SH", 20), ("SF", 15),
+                      ("GIDP", 30)]:
+        batting[col] = rng.integers(0, high, m)
+    batting.loc[batting["yearID"] < 1920, ["CS", "IBB", "GIDP"]] = np.nan
+    write(batting, out, "Batting")
+
+    pitching = stints.sample(frac=0.4, random_state=seed + 1).sort_index()
+    k = len(pitching)
+    for col, high in [("W", 25), ("L", 20), ("G", 70), ("GS", 35),
+                      ("CG", 10), ("SHO", 5), ("SV", 45), ("IPouts", 750),
+                      ("H", 250), ("ER", 120), ("HR", 40), ("BB", 100),
+                      ("SO", 300), ("IBB", 10), ("WP", 15), ("HBP", 15),
+                      ("BK", 5), ("BFP", 1000), ("GF", 60), ("R", 130),
+                      ("SH", 10), ("SF", 10), ("GIDP", 25)]:
+        pitching[col] = rng.integers(0, high, k)
+    pitching["IPouts"] += 1
+    pitching["ERA"] = np.round(27 * pitching["ER"] / pitching["IPouts"], 2)
+    pitching["BAOpp"] = np.round(rng.uniform(0.15, 0.35, k), 3)
+    write(pitching[pitching_columns], out, "Pitching")
+
+    fielding = pd.concat([stints.assign(POS="OF"),
+                          stints.sample(frac=0.3, random_state=seed + 2)
+                                .assign(POS="1B")]).sort_values(
+        ["playerID", "yearID", "stint"])
+    f = len(fielding)
+    for col, high in [("G", 162), ("GS", 162), ("InnOuts", 4300),
+                      ("PO", 1200), ("A", 500), ("E", 30), ("DP", 120)]:
+        fielding[col] = rng.integers(0, high, f)
+    for col in ["PB", "WP", "SB", "CS", "ZR"]:
+        fielding[col] = np.where(rng.random(f) < 0.1,
+                                 rng.integers(0, 20, f), np.nan)
+    write(fielding, out, "Fielding")
+
+    hof = people.sample(frac=0.02, random_state=seed)[["playerID"]].copy()
+    hof["yearid"] = rng.integers(1936, 2020, len(hof))
+    hof["votedBy"] = "BBWAA"
+    hof["ballots"] = 500
+    hof["needed"] = 375
+    hof["votes"] = rng.integers(0, 500, len(hof))
+    hof["inducted"] = np.where(hof["votes"] >= 375, "Y", "N")
+    hof["category"] = "Player"
+    hof["needed_note"] = ""
+    write(hof, out, "HallOfFame")
+
+    allstar = seasons.sample(frac=0.05, random_state=seed + 3)
+    allstar = allstar[allstar["yearID"] >= 1933].copy()
+    allstar["gameNum"] = 0
+    allstar["gameID"] = "ALS" + allstar["yearID"].astype(str)
+    allstar = allstar.merge(stints[stints["stint"] == 1][
+        ["playerID", "yearID", "teamID", "lgID"]], on=["playerID", "yearID"])
+    allstar["GP"] = 1
+    allstar["startingPos"] = np.nan
+    write(allstar[["playerID", "yearID", "gameNum", "gameID", "teamID",
+                   "lgID", "GP", "startingPos"]], out, "AllstarFull")
+
+    winners = seasons.sample(frac=0.04, random_state=seed + 4).copy()
+    winners["awardID"] = rng.choice(awards, len(winners))
+    extra = winners.sample(frac=0.3, random_state=seed + 5).copy()
+    extra["awardID"] = "Most Valuable Player"
+    winners = pd.concat([winners, extra]).drop_duplicates(
+        ["playerID", "yearID", "awardID"])
+    winners["lgID"] = "ML"
+    winners["tie"] = ""
+    winners["notes"] = ""
+    write(winners[["playerID", "awardID", "yearID", "lgID", "tie", "notes"]],
+          out, "AwardsPlayers")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out")
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--first-year", type=int, default=1871)
+    parser.add_argument("--last-year", type=int, default=2018)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    main(args.out, args.players, args.first_year, args.last_year, args.seed)
@@ -0,0 +1,58 @@
+# Gunicorn settings for serving the app with several worker processes
+#
+#     gunicorn -c gunicorn.conf.py baseballStatisticsVisualization:server
+#
+# preload_app imports baseballStatisticsVisualization once in the master,
+# so the Lahman tables, season indexes and search keys are read (or
+# unpickled from the cache) a single time and every worker forked from the
+# master shares those pages copy-on-write instead of loading its own copy
+# after the import the loaded objects are moved into the garbage collector's
+# permanent generation, so that collections in the workers do not write to
+# (and so copy) every page holding one of them
+#
+# the figure cache is per worker, a figure built by one worker is not seen
+# by the others
+#
+# new or corrected Lahman csv files are picked up without a restart: each
+# worker watches the data directory (LAHMAN_RELOAD_SECONDS) and loads its
+# own new snapshot, so after a reload the frames rebuilt for it are no
+# longer shared with the master (the memory mapped arrays still are)
+# a HUP does not reload the data, the preloaded master keeps its snapshot
+#
+# Every callback is CPU bound and holds the GIL, so throughput scales with
+# the number of worker processes up to the number of cores, while threads
+# only help overlap the time spent in network I/O. The default is one worker
+# per core with two threads each. Measure on the target host by running the
+# same load against WEB_CONCURRENCY=1, 2, 4, ... up to the core count. Once
+# WEB_CONCURRENCY is at the core count, adding workers only adds memory.
+#
+#     python benchmarks/load_test.py --workers N --profile mixed \
+#            --concurrency 1,4,8 --duration 10 --players 5000
+#
+# measured on a single core host (the load generator running on the same
+# core), requests per second at 1 / 4 / 8 users:
+#
+#     workers 1    312 / 452 / 508
+#     workers 2    285 / 330 / 363
+#     workers 4    271 / 272 / 304
+#
+# with one core, extra workers only add context switches and split the
+# figure cache, so throughput drops; scaling across several cores has not
+# been measured yet, rerun the same commands on a multi core host
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 2))
+worker_class = "gthread"
+preload_app = True
+timeout = 60
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+def when_ready(server):
+    gc.collect()
+    gc.freeze()
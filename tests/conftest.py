@@ -0,0 +1,36 @@
+# The app loads its data when it is imported, so the tests import it once
+# per session against a synthetic databank (benchmarks/synthetic_lahman.py)
+# written to a temporary directory, with its own cache directory
+#
+#     python -m pytest -q tests
+
+import os
+import sys
+import warnings
+
+import pytest
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+module = "baseballStatisticsVisualization"
+
+test_players = 2000
+
+@pytest.fixture(scope = "session")
+def app(tmp_path_factory):
+    sys.path.insert(0, os.path.join(root, "benchmarks"))
+    sys.path.insert(0, root)
+    import synthetic_lahman
+    scratch = tmp_path_factory.mktemp("lahman")
+    data = os.path.join(str(scratch), "core")
+    synthetic_lahman.main(data, test_players, 1871, 2018, 0)
+    os.environ.update(LAHMAN_DATA_PATH = os.path.join(data, ""),
+                      LAHMAN_CACHE_PATH = os.path.join(str(scratch), "cache"),
+                      LAHMAN_RELOAD_SECONDS = "0")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return __import__(module)
+
+@pytest.fixture(scope = "session")
+def data(app):
+    return app.data_manager.snapshot
@@ -0,0 +1,15 @@
+# award_seasons against a plain mask over award_bits
+
+def test_award_seasons_matches_mask(app, data):
+    bits = data.award_bits
+    for award, flag in app.award_flags.items():
+        for first, last in [(1871, 2018), (1950, 1960), (2000, 2000),
+                            (1800, 1850)]:
+            mask = ((bits["flags"] & flag) != 0) & (
+                   bits["yearID"] >= first) & (bits["yearID"] <= last)
+            expected = sorted(zip(
+            data.player_ids.categories[bits.loc[mask, "player"]],
+            bits.loc[mask, "yearID"]))
+            assert sorted(app.award_seasons(data, award, first,
+                                            last)) == expected
+    assert app.award_seasons(data, "Most Valuable Player", 1871, 2018)
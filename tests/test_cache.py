@@ -0,0 +1,72 @@
+# The pickle and .npy caches under the test databank's cache directory
+
+import glob
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+def test_key_changes_with_pandas_and_numpy(app, monkeypatch):
+    key = app.source_key(["Teams.csv"])
+    monkeypatch.setattr(app.pd, "__version__", "0.0")
+    assert app.source_key(["Teams.csv"]) != key
+    monkeypatch.undo()
+    monkeypatch.setattr(app.np, "__version__", "0.0")
+    assert app.source_key(["Teams.csv"]) != key
+
+def test_unreadable_pickle_is_rebuilt(app):
+    path = os.path.join(app.cache_path, "unreadable-{}.pkl".format(
+                        app.source_key(["Teams.csv"])))
+    with open(path, "wb") as out:
+        out.write(b"not a pickle")
+    frame = pd.DataFrame({"W" : [1, 2]})
+    with pytest.warns(UserWarning, match = "unreadable"):
+        built = app.cached_frame("unreadable", ["Teams.csv"], lambda: frame)
+    assert built.equals(frame)
+    assert pd.read_pickle(path).equals(frame)
+
+class FailingFrame:
+
+    # stands in for a frame whose pickle fails half way (a full disk)
+    def to_pickle(self, path):
+        with open(path, "w") as out:
+            out.write("half")
+        raise OSError("no space left on device")
+
+def test_failed_pickle_write_leaves_no_temp_file(app):
+    app.cached_frame("failing", ["Teams.csv"], FailingFrame)
+    assert glob.glob(os.path.join(app.cache_path, "failing-*")) == []
+
+def test_abandoned_temp_directories_are_swept(app):
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    key = app.source_key(["Teams.csv"])
+    temps = {pid : os.path.join(app.cache_path, "sweep-{}.{}.tmp".format(
+                                key, pid))
+             for pid in [os.getppid(), finished.pid, 1]}
+    for temp in temps.values():
+        app.save_arrays(temp, {"x" : np.arange(3)})
+    # (this process's parent is alive and still writing, pid 1 is alive
+    # but its directory is older than any write takes)
+    old = time.time() - app.temp_max_seconds - 60
+    os.utime(temps[1], (old, old))
+    app.cached_arrays("sweep", ["Teams.csv"], lambda: {"x" : np.arange(3)})
+    assert os.path.isdir(temps[os.getppid()])
+    assert not os.path.exists(temps[finished.pid])
+    assert not os.path.exists(temps[1])
+
+def test_abandoned_temp_pickles_are_swept(app):
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    path = os.path.join(app.cache_path, "sweep_frame-{}.pkl".format(
+                        app.source_key(["Teams.csv"])))
+    temp = "{}.{}.tmp".format(path, finished.pid)
+    with open(temp, "w") as out:
+        out.write("half")
+    app.cached_frame("sweep_frame", ["Teams.csv"],
+                     lambda: pd.DataFrame({"W" : [1]}))
+    assert not os.path.exists(temp) and os.path.exists(path)
@@ -0,0 +1,42 @@
+# Leaderboards for the leagues the Leaders tab offers
+
+def test_national_association_seasons_are_ranked(app, data):
+    for name in ["batting", "pitching", "fielding"]:
+        leagues = data.tables[name + "_ranks"]["groups"]["leagues"].tolist()
+        assert "NA" in leagues and "nan" not in leagues
+    leaders = app.leaderboard(data, "batting", "HR", 1872, "NA")
+    assert leaders
+    assert {leader["lgID"] for leader in leaders} == {"NA"}
+
+def test_career_leaderboards_are_for_the_whole_majors(app, data):
+    assert app.leaderboard(data, "batting", "HR")
+    assert app.leaderboard(data, "batting", "HR", None, "AL") == []
+    client = app.server.test_client()
+    response = client.get("/api/leaders/batting?stat=HR&league=AL")
+    assert response.status_code == 400
+    response = client.get("/api/leaders/batting?stat=HR")
+    assert response.status_code == 200
+    assert response.get_json()["league"] == "MLB"
+
+def test_malformed_year_and_limit_are_rejected(app):
+    client = app.server.test_client()
+    for query in ["year=abc", "limit=x", "year=1998&limit=1.5"]:
+        response = client.get("/api/leaders/batting?stat=HR&" + query)
+        assert response.status_code == 400, query
+    response = client.get("/api/leaders/batting?stat=HR&year=1998&limit=5")
+    assert response.status_code == 200
+    assert len(response.get_json()["leaders"]) == 5
+
+def test_only_the_dropdown_stats_are_ranked(app, data):
+    dropdowns = {"batting" : app.Batting_Stats_Dropdown_Leaders,
+                 "pitching" : app.Pitching_Stats_Dropdown_Leaders,
+                 "fielding" : app.Fielding_Stats_Dropdown_Leaders}
+    for name, dropdown in dropdowns.items():
+        stats = {option["value"] for option in dropdown.options}
+        assert set(app.leaderboard_stats[name]) == stats
+        ranks = data.tables[name + "_ranks"]
+        assert set(ranks["season"]) <= stats
+        assert set(ranks["career"]) <= stats
+    client = app.server.test_client()
+    response = client.get("/api/leaders/fielding?stat=InnOuts&year=2000")
+    assert response.status_code == 404
@@ -0,0 +1,30 @@
+# Sizes of the encoded callback payloads for representative figures
+# each limit is about 20% over the size the compact encoding gives on the
+# test databank; before it, player figures were around 8.4 KB and team and
+# league figures 9 to 11 KB, so losing any part of the compaction (the
+# trimmed template, scalar bar widths, whole numbers without ".0") fails
+# here rather than only raising encode_payload's runtime warning
+
+import pytest
+
+compare_players = ["mauerjo01", "p000002", "p000003", "p000004", "p000005"]
+
+payload_limits = [
+("STATS_GRAPH_BAT.figure", ("mauerjo01", "HR", "none"), 1800),
+("STATS_GRAPH_BAT.figure", ("mauerjo01", "BA", "rolling"), 2300),
+("STATS_GRAPH_BAT.figure", ("mauerjo01", "HR", "rolling"), 2200),
+("STATS_GRAPH_PITCH.figure", ("clemero02", "ERA", "none"), 1900),
+("STATS_GRAPH_PITCH.figure", ("clemero02", "SO", "career"), 2300),
+("STATS_GRAPH_FIELD.figure", ("mauerjo01", "E", "none"), 1800),
+("COMPARE_GRAPH_BAT.figure", (compare_players, "HR", "year"), 2200),
+("STATS_GRAPH_BAT_TEAM.figure", ("MIN", "HR", "W"), 4700),
+("STATS_GRAPH_PITCH_TEAM.figure", ("MIN", "RA", "attendance"), 5500),
+("STATS_GRAPH_BAT_LEAGUE.figure", ("Both", "HR", [1871, 2018]), 5300),
+("STATS_GRAPH_PITCH_LEAGUE.figure", ("AL", "ERA", [1901, 2018]), 4500)]
+
+@pytest.mark.parametrize("output_id, args, limit", payload_limits)
+def test_payload_size(app, data, output_id, args, limit):
+    # the callback's own function, below the figure cache
+    build = app.app.callback_map[output_id]["callback"].__wrapped__.__wrapped__
+    payload = app.encode_payload(output_id, build(data, *args))
+    assert len(payload) <= limit, (output_id, args, len(payload))
@@ -0,0 +1,59 @@
+# Hot reload: a copy of the test databank with one Teams.csv value changed
+# is loaded through data_manager.reload(), then the original is loaded back
+# so the other tests keep seeing it
+
+import os
+import shutil
+
+import pandas as pd
+
+def dependents(graph, files):
+    nodes = {name for name, (_, sources, _, _) in graph.items()
+             if set(sources) & set(files)}
+    while True:
+        more = {name for name, (_, _, deps, _) in graph.items()
+                if set(deps) & nodes} - nodes
+        if not more:
+            return nodes
+        nodes |= more
+
+def team_hr(figure, year):
+    trace = [trace for trace in figure["data"] if trace["name"] == "HR"][0]
+    return trace["y"][trace["x"].index(year)]
+
+def test_reload_rebuilds_only_what_changed(app, tmp_path, monkeypatch):
+    original = app.data_path
+    copy = os.path.join(str(tmp_path), "core", "")
+    # copy2 keeps sizes and modification times, so the copy has the same
+    # version and cache keys as the original
+    shutil.copytree(original, copy, copy_function = shutil.copy2)
+    monkeypatch.setattr(app, "data_path", copy)
+    before = app.data_manager.reload()
+    assert before.rebuilt == []
+
+    team_graph = app.app.callback_map["STATS_GRAPH_BAT_TEAM.figure"][
+                 "callback"].__wrapped__
+    assert team_hr(team_graph("MIN", "HR", "W"), 2000) != 9999
+    teams = pd.read_csv(os.path.join(copy, "Teams.csv"),
+                        keep_default_na = False)
+    teams.loc[(teams["teamID"] == "MIN") & (teams["yearID"] == 2000),
+              "HR"] = 9999
+    teams.to_csv(os.path.join(copy, "Teams.csv"), index = False)
+    try:
+        after = app.data_manager.reload()
+        expected = dependents(app.data_graph, ["Teams.csv"])
+        assert set(after.rebuilt) == expected
+        assert {"teams", "league_cube", "team_store"} <= expected
+        assert not expected & {"people", "batting_stints", "batting_index",
+                               "batting_ranks", "pitching_index"}
+        for name in app.data_graph:
+            if name not in expected:
+                assert after.tables[name] is before.tables[name], name
+        assert after.version != before.version
+        assert app.data_manager.snapshot is after
+        # the figure cache entry built from the old data is not served
+        assert team_hr(team_graph("MIN", "HR", "W"), 2000) == 9999
+    finally:
+        monkeypatch.setattr(app, "data_path", original)
+        restored = app.data_manager.reload()
+    assert restored.version == before.version
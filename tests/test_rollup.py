@@ -0,0 +1,101 @@
+# rollup_seasons on small hand made stint tables, typed the way read_stints
+# reads them (counts as nullable ints, IDs as categoricals, ratios float64),
+# and multi-stint ERA over the whole synthetic pitching table
+
+import numpy as np
+import pandas as pd
+
+def stints(rows, counts, ratios = ()):
+    frame = pd.DataFrame(rows)
+    return frame.astype({**{col : "Int16" for col in counts},
+                         **{col : "float64" for col in ratios},
+                         "player" : "int32", "yearID" : "int16",
+                         "stint" : "int8", "teamID" : "category",
+                         "lgID" : "category"})
+
+def season(seasons, player, year):
+    rows = seasons[(seasons["player"] == player) &
+                   (seasons["yearID"] == year)]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+def test_traded_batter(app):
+    batting = app.build_batting(stints([
+    dict(player = 0, yearID = 1990, stint = 1, teamID = "SEA", lgID = "AL",
+         G = 50, AB = 40, H = 10, HR = 2),
+    dict(player = 0, yearID = 1990, stint = 2, teamID = "NYA", lgID = "AL",
+         G = 30, AB = 20, H = 5, HR = 1),
+    dict(player = 1, yearID = 1990, stint = 1, teamID = "MIN", lgID = "AL",
+         G = 70, AB = 200, H = 60, HR = 9),
+    dict(player = 1, yearID = 1990, stint = 2, teamID = "CHN", lgID = "NL",
+         G = 60, AB = 100, H = 25, HR = 4),
+    dict(player = 1, yearID = 1991, stint = 1, teamID = "CHN", lgID = "NL",
+         G = 150, AB = 500, H = 150, HR = 20)], ["G", "AB", "H", "HR"]))
+    traded = season(batting, 0, 1990)
+    assert (traded["G"], traded["AB"], traded["H"], traded["HR"]) == (
+            80, 60, 15, 3)
+    assert traded["stints"] == 2
+    assert traded["teamID"] == "SEA/NYA"
+    assert traded["lgID"] == "AL"
+    assert traded["BA"] == 250
+    assert season(batting, 1, 1990)["teamID"] == "MIN/CHN"
+    assert season(batting, 1, 1990)["lgID"] == "ML"
+    assert season(batting, 1, 1991)["lgID"] == "NL"
+    assert season(batting, 1, 1991)["stints"] == 1
+
+pitching_counts = ["W", "IPouts", "H", "ER", "BB", "HBP", "SH", "SF", "BFP"]
+
+def test_pitching_ratios(app):
+    pitching = app.rollup_seasons(stints([
+    dict(player = 0, yearID = 2000, stint = 1, teamID = "BOS", lgID = "AL",
+         W = 5, IPouts = 300, H = 90, ER = 40, BB = 30, HBP = 3, SH = 4,
+         SF = 2, BFP = 430, ERA = 3.6, BAOpp = 0.229),
+    dict(player = 0, yearID = 2000, stint = 2, teamID = "NYA", lgID = "AL",
+         W = 3, IPouts = 150, H = 50, ER = 25, BB = 15, HBP = 1, SH = 2,
+         SF = 1, BFP = 220, ERA = 4.5, BAOpp = 0.249),
+    # published values that differ from the formula, as rounding in the
+    # source sometimes makes them
+    dict(player = 1, yearID = 2000, stint = 1, teamID = "BOS", lgID = "AL",
+         W = 10, IPouts = 600, H = 180, ER = 70, BB = 50, HBP = 5, SH = 5,
+         SF = 5, BFP = 850, ERA = 3.14, BAOpp = 0.24)],
+    pitching_counts, ["ERA", "BAOpp"]), app.pitching_ratios)
+    traded = season(pitching, 0, 2000)
+    assert traded["IPouts"] == 450 and traded["ER"] == 65
+    assert traded["ERA"] == round(27 * 65 / 450, 2)
+    assert traded["BAOpp"] == round(140 / (650 - 45 - 4 - 6 - 3), 3)
+    single = season(pitching, 1, 2000)
+    assert (single["ERA"], single["BAOpp"]) == (3.14, 0.24)
+
+def test_zone_rating_is_not_summed(app):
+    fielding = app.rollup_seasons(stints([
+    dict(player = 0, yearID = 2005, stint = 1, teamID = "SEA", lgID = "AL",
+         POS = "SS", G = 40, E = 3, ZR = 2.0),
+    dict(player = 0, yearID = 2005, stint = 2, teamID = "NYA", lgID = "AL",
+         POS = "SS", G = 20, E = 1, ZR = 1.0),
+    dict(player = 1, yearID = 2005, stint = 1, teamID = "SEA", lgID = "AL",
+         POS = "2B", G = 100, E = 7, ZR = 4.0),
+    dict(player = 2, yearID = 2005, stint = 1, teamID = "SEA", lgID = "AL",
+         POS = "2B", G = 50, E = 2, ZR = 1.5),
+    dict(player = 2, yearID = 2005, stint = 1, teamID = "SEA", lgID = "AL",
+         POS = "3B", G = 30, E = 2, ZR = 0.5)], ["G", "E"], ["ZR"]))
+    traded = season(fielding, 0, 2005)
+    assert traded["G"] == 60 and traded["E"] == 4
+    assert np.isnan(traded["ZR"])
+    assert season(fielding, 1, 2005)["ZR"] == 4.0
+    # one stint at two positions is two rows, neither ZR is the season's
+    two_positions = season(fielding, 2, 2005)
+    assert two_positions["G"] == 80 and np.isnan(two_positions["ZR"])
+    assert two_positions["teamID"] == "SEA"
+
+def test_multi_stint_era_on_the_databank(app, data):
+    raw = data.pitching_stints
+    totals = raw.groupby(["player", "yearID"], observed = True)[
+             ["ER", "IPouts"]].sum(min_count = 1).astype("float64")
+    seasons = app.rollup_seasons(raw, app.pitching_ratios).set_index(
+              ["player", "yearID"])
+    traded = seasons["stints"] > 1
+    assert traded.any()
+    expected = np.round(27 * totals["ER"] / totals["IPouts"], 2).replace(
+               [np.inf, -np.inf], np.nan)
+    assert np.allclose(seasons.loc[traded, "ERA"],
+                       expected.loc[seasons.index[traded]], equal_nan = True)
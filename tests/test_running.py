@@ -0,0 +1,71 @@
+# running_stats against pandas' own groupby cumsum and rolling mean, for
+# stats the early seasons did not record (caught stealing, intentional
+# walks), for the default window and a wider one, and for the ratio stats
+# recomputed from the summed components
+
+import numpy as np
+import pandas as pd
+
+def season_rows(app, data, name):
+    # the season frame in the index's row order (see build_season_index)
+    frame = app.season_frame(data.tables, name)
+    return frame.dropna(subset = ["yearID"]).sort_values(
+           ["player", "yearID"], kind = "mergesort").reset_index(drop = True)
+
+def career_totals(frame, col):
+    values = frame[col].astype("float64")
+    recorded = values.notna().groupby(frame["player"]).cumsum() > 0
+    return values.fillna(0).groupby(frame["player"]).cumsum().where(recorded)
+
+def rolling(frame, col, window, how):
+    # NaN seasons count towards the window but not towards the average
+    values = frame[col].astype("float64").groupby(frame["player"]).rolling(
+             window, min_periods = 1)
+    return getattr(values, how)().reset_index(level = 0, drop = True
+                                              ).sort_index()
+
+def ratio(values):
+    return values.replace([np.inf, -np.inf], np.nan).to_numpy()
+
+def check_running(frame, running, window):
+    assert frame["CS"].isna().any() and frame["IBB"].isna().any()
+    for col in ["HR", "AB", "CS", "IBB"]:
+        assert np.array_equal(running["career"][col],
+                              career_totals(frame, col).to_numpy(
+                              dtype = "float32"), equal_nan = True), col
+        assert np.array_equal(running["rolling"][col],
+                              np.round(rolling(frame, col, window, "mean"),
+                                       2).to_numpy(), equal_nan = True), col
+    career_ba = np.round(1000 * career_totals(frame, "H") /
+                         career_totals(frame, "AB"), 2)
+    rolling_ba = np.round(1000 * rolling(frame, "H", window, "sum") /
+                          rolling(frame, "AB", window, "sum"), 2)
+    assert np.array_equal(running["career"]["BA"], ratio(career_ba),
+                          equal_nan = True)
+    assert np.array_equal(running["rolling"]["BA"], ratio(rolling_ba),
+                          equal_nan = True)
+
+def test_batting_running_stats(app, data):
+    frame = season_rows(app, data, "batting")
+    index = data.batting_index
+    assert np.array_equal(index["columns"]["yearID"], frame["yearID"])
+    check_running(frame, index["running"], app.rolling_seasons)
+
+def test_wider_window(app, data, monkeypatch):
+    frame = season_rows(app, data, "batting")
+    monkeypatch.setattr(app, "rolling_seasons", 5)
+    check_running(frame, app.running_stats(frame, app.batting_ratios), 5)
+
+def test_pitching_era(app, data):
+    frame = season_rows(app, data, "pitching")
+    running = data.pitching_index["running"]
+    career_era = np.round(27 * career_totals(frame, "ER") /
+                          career_totals(frame, "IPouts"), 2)
+    window = app.rolling_seasons
+    rolling_era = np.round(27 * rolling(frame, "ER", window, "sum") /
+                           rolling(frame, "IPouts", window, "sum"), 2)
+    assert np.array_equal(running["career"]["ERA"], ratio(career_era),
+                          equal_nan = True)
+    assert np.array_equal(running["rolling"]["ERA"], ratio(rolling_era),
+                          equal_nan = True)
+    assert np.isnan(running["career"]["ERA"]).sum() < len(frame)
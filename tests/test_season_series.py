@@ -0,0 +1,63 @@
+# season_series against the per-year loop the player graphs used before it,
+# for every player and every stat in the batting, pitching and fielding
+# dropdowns (award seasons come from AwardsPlayers, as the loop read them,
+# less awards in a year with no row in that table, which are no longer
+# drawn as a zero height bar since the season indexes carry the awards)
+
+import numpy as np
+
+def player_awards(app, data):
+    awards = {}
+    for code, year, flags in data.award_bits[
+        ["player", "yearID", "flags"]].itertuples(index = False):
+        for award, bit in app.award_flags.items():
+            if flags & bit:
+                awards.setdefault(code, {}).setdefault(award, set()).add(year)
+    return awards
+
+def per_year_loop(years, values, awards):
+    seasons = dict(zip(years.tolist(), values.tolist()))
+    series = [([], []) for _ in range(len(awards) + 1)]
+    for i in range(years[0], years[-1] + 1):
+        if i not in seasons:
+            series[0][0].append(i)
+            series[0][1].append(0)
+        elif all(i not in award for award in awards):
+            series[0][0].append(i)
+            series[0][1].append(seasons[i])
+        for award, (x, y) in zip(awards, series[1:]):
+            if i in award:
+                x.append(i)
+                y.append(seasons.get(i, 0))
+    return series
+
+def same(left, right):
+    return np.array_equal(np.asarray(left, dtype = float),
+                          np.asarray(right, dtype = float), equal_nan = True)
+
+def test_season_series_matches_per_year_loop(app, data):
+    compared = 0
+    awarded = player_awards(app, data)
+    for index, dropdown, awards in [
+        (data.batting_index, app.Batting_Stats_Dropdown,
+         ["Silver Slugger", "Most Valuable Player"]),
+        (data.pitching_index, app.Pitching_Stats_Dropdown,
+         ["Cy Young Award", "Most Valuable Player"]),
+        (data.fielding_index, app.Fielding_Stats_Dropdown,
+         ["Gold Glove", "Most Valuable Player"])]:
+        players = np.flatnonzero(index["stops"] > index["starts"])
+        for Playerid in data.player_ids.categories[players]:
+            for Stat in [option["value"] for option in dropdown.options]:
+                years, values, flags = app.player_seasons(data, index,
+                                                          Playerid, Stat)
+                won = [awarded.get(data.player_codes[Playerid], {}).get(
+                       award, set()) & set(years.tolist())
+                       for award in awards]
+                expected = per_year_loop(years, values, won)
+                for (x, y), (old_x, old_y) in zip(
+                    app.season_series(years, values, flags, awards),
+                    expected):
+                    assert same(x, old_x) and same(y, old_y), (Playerid,
+                                                               Stat)
+                compared += 1
+    assert compared > 0